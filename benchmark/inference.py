@@ -0,0 +1,54 @@
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from src.data.scenario_generator import ScenarioGenerator
+
+COLUMNS = ['path', 'decisions', 'mean latency (ms)', 'median latency (ms)']
+
+
+def time_decisions(decide, decisions: list, num_of_repeats: int) -> list:
+    """ wall time in seconds of every single decision, after one warm up call per agent """
+    for agent, state in decisions:
+        decide(agent, state)
+    latencies = []
+    for index in range(num_of_repeats):
+        agent, state = decisions[index % len(decisions)]
+        start = time.perf_counter()
+        decide(agent, state)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sensors', type=int, default=100)
+    parser.add_argument('--uavs', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    from src.data.file_manager import FileManager
+    from src.environment.core.controller import EnvironmentController
+    with tempfile.TemporaryDirectory() as input_dir:
+        ScenarioGenerator(num_of_sensors=args.sensors, num_of_uavs=args.uavs, seed=args.seed).write(input_dir)
+        env = FileManager(solution_id=0, input_dir=input_dir).load_environment()
+    env.reset()
+    forwarding_agents, _ = EnvironmentController.create_agents(env)
+    for agent in forwarding_agents:
+        agent.inject_environment_object(env)
+    decisions = [(agent, agent.observe()) for agent in forwarding_agents]
+    paths = {
+        'predict': lambda agent, state: agent.model.predict(np.array([state]), verbose=0)[0],
+        'traced inference': lambda agent, state: agent.get_q_values([state])[0],
+    }
+    for name, decide in paths.items():
+        latencies = np.array(time_decisions(decide, decisions, args.repeats)) * 1000
+        row = [name, len(latencies), np.mean(latencies), np.median(latencies)]
+        print(', '.join(f'{column}: {value}' for column, value in zip(COLUMNS, row)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
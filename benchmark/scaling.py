@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+
+import pandas as pd
+
+from src.data.scenario_generator import ScenarioGenerator
+
+DEFAULT_SIZES = ['10:2', '100:5', '1000:20', '10000:50', '50000:200']
+COLUMNS = ['commit', 'sensors', 'uavs', 'load time', 'reset time', 'steps', 'steps per second', 'peak memory']
+
+
+def run_scenario(input_dir: str, num_of_steps: int) -> tuple:
+    """ loads, resets and steps the scenario the same way the console run type does, with data collection enabled """
+    from src.data.file_manager import FileManager
+    from src.rl.data_collecting.data_collecting_agent import DataCollectingAgent
+    start = time.perf_counter()
+    env = FileManager(solution_id=0, input_dir=input_dir).load_environment()
+    load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    env.reset()
+    reset_time = time.perf_counter() - start
+    agents = [DataCollectingAgent(uav=uav, environment=env) for uav in env.uavs]
+    steps = 0
+    start = time.perf_counter()
+    while not env.has_ended() and steps < num_of_steps:
+        for agent in agents:
+            agent.take_random_action()
+        env.step()
+        steps += 1
+    steps_per_second = steps / max(time.perf_counter() - start, 1e-9)
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return load_time, reset_time, steps, steps_per_second, peak_memory
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='scenarios as sensors:uavs')
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--layout', choices=['random', 'clustered'], default='random')
+    parser.add_argument('--tour', choices=['sweep', 'nearest'], default='sweep')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=str, default='data/output/benchmark.csv')
+    args = parser.parse_args()
+    commit = get_commit()
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    for size in args.sizes:
+        num_of_sensors, num_of_uavs = map(int, size.split(':'))
+        with tempfile.TemporaryDirectory() as input_dir:
+            ScenarioGenerator(num_of_sensors=num_of_sensors, num_of_uavs=num_of_uavs, layout=args.layout,
+                              tour=args.tour, seed=args.seed).write(input_dir)
+            with context.Pool(processes=1) as pool:
+                result = pool.apply(run_scenario, (input_dir, args.steps))
+        rows.append([commit, num_of_sensors, num_of_uavs, *result])
+        print(', '.join(f'{column}: {value}' for column, value in zip(COLUMNS, rows[-1])), file=sys.stderr)
+    table = pd.DataFrame(rows, columns=COLUMNS)
+    if os.path.exists(args.output):
+        table = pd.concat([pd.read_csv(args.output), table])
+    table.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
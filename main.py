@@ -8,9 +8,18 @@ def main():
     parser.add_argument('solution', type=int)
     parser.add_argument('run_type', type=str)
     parser.add_argument('num_of_episodes', type=int)
+    parser.add_argument('--event-driven', action='store_true')
+    parser.add_argument('--flow-level', action='store_true')
+    parser.add_argument('--sensing', action='store_true')
+    parser.add_argument('--num-of-environments', type=int, default=1)
+    parser.add_argument('--num-of-workers', type=int, default=0)
+    parser.add_argument('--instrument', action='store_true')
     args = parser.parse_args()
     EnvironmentController.run(solution_id=args.solution, run_type=args.run_type, log_on_file=True,
-                              num_of_episodes=args.num_of_episodes)
+                              num_of_episodes=args.num_of_episodes, event_driven=args.event_driven,
+                              num_of_environments=args.num_of_environments, num_of_workers=args.num_of_workers,
+                              instrument=args.instrument, flow_level=args.flow_level,
+                              sensing=args.sensing)
 
 
 if __name__ == '__main__':
@@ -10,6 +10,7 @@ from src.environment.simulation_models.energy.energy_model import EnergyModel
 from src.environment.core.environment import Environment
 from src.environment.devices.base_station import BaseStation
 from src.environment.simulation_models.memory.memory import Memory
+from src.environment.simulation_models.memory.columnar_memory import ColumnarMemory
 from src.environment.devices.sensor import Sensor
 from src.environment.devices.uav import UAV
 from src.environment.simulation_models.memory.memory_model import MemoryModel
@@ -17,6 +18,8 @@ from src.environment.simulation_models.network.connection_protocol import Connec
 from src.environment.simulation_models.network.network_model import NetworkModel
 from src.environment.utils.vector import Vector
 
+MEMORY_TYPES = {'heap': Memory, 'columnar': ColumnarMemory}
+
 
 @dataclass
 class FileManager:
@@ -24,15 +27,17 @@ class FileManager:
     memory_models: list = field(init=False, default_factory=list)
     network_models: list = field(init=False, default_factory=list)
     energy_model: EnergyModel = field(init=False, default_factory=list)
+    input_dir: str = None
 
     def __post_init__(self):
-        current_dir = os.getcwd()
-        self.input_dir = f'{current_dir}/data/input/test_sample_{self.solution_id}/'
+        if self.input_dir is None:
+            current_dir = os.getcwd()
+            self.input_dir = f'{current_dir}/data/input/test_sample_{self.solution_id}/'
 
     def read_table(self, name: str) -> Any:
         if len(name) <= 4 or name[-4:] != '.csv':
             name += '.csv'
-        return pd.read_csv(self.input_dir + name)
+        return pd.read_csv(os.path.join(self.input_dir, name))
 
     def load_basic_variables(self) -> Tuple:
         basic_variables_table = self.read_table(name='environment_basics')
@@ -63,11 +68,13 @@ class FileManager:
             packet_life_time = row['packet life time']
             packet_size = row['packet size']
             sampling_rate = row['sampling rate']
+            packet_expiry = bool(row['packet expiry']) if 'packet expiry' in table.columns else False
             sensor = Sensor(position=position, velocity=velocity, acceleration=acceleration, id=id,
                             memory_model=self.memory_models[0], network_model=deepcopy(self.network_models[0]),
                             num_of_collected_packets=0, data_collecting_rate=data_collecting_rate,
                             packet_size=packet_size, packet_time_to_live=packet_life_time, consumed_energy=0,
-                            energy_model=self.energy_model, sampling_rate=sampling_rate)
+                            energy_model=self.energy_model, sampling_rate=sampling_rate,
+                            packet_expiry=packet_expiry)
             # sensor.network_model.center = sensor.position
             sensor.collect_data()
             sensors.append(sensor)
@@ -121,8 +128,9 @@ class FileManager:
         table = self.read_table(name='memory_models')
         data = []
         for index, row in table.iterrows():
-            sending_buffer = Memory(size=row['buffer size'], io_speed=row['buffer io speed'])
-            memory = Memory(size=row['memory size'], io_speed=row['memory io speed'])
+            memory_type = MEMORY_TYPES[row['memory type']] if 'memory type' in table.columns else Memory
+            sending_buffer = memory_type(size=row['buffer size'], io_speed=row['buffer io speed'])
+            memory = memory_type(size=row['memory size'], io_speed=row['memory io speed'])
             receiving_buffer = copy.copy(sending_buffer)
             data.append(MemoryModel(sending_buffer=sending_buffer, receiving_buffer=receiving_buffer, memory=memory))
         return data
@@ -139,7 +147,8 @@ class FileManager:
             data.append(network)
         return data
 
-    def load_environment(self) -> Environment:
+    def load_environment(self, event_driven: bool = False, flow_level: bool = False,
+                         sensing: bool = False) -> Environment:
         height, width, speed_rate, run_until, self.energy_model = self.load_basic_variables()
         self.memory_models = self.load_memories()
         self.network_models = self.load_networks()
@@ -147,4 +156,5 @@ class FileManager:
         sensors = self.load_sensors()
         base_stations = self.load_base_stations()
         return Environment(land_height=height, land_width=width, speed_rate=speed_rate, uavs=uavs, sensors=sensors,
-                           base_stations=base_stations, run_until=run_until)
+                           base_stations=base_stations, run_until=run_until, event_driven=event_driven,
+                           flow_level=flow_level, sensing=sensing)
@@ -0,0 +1,72 @@
+import time
+import logging
+import functools
+from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PhaseTimer:
+    calls: int = 0
+    total_time: float = 0
+
+
+@dataclass
+class Instrumentation:
+    """
+    Cumulative wall time and number of calls of the functions decorated with measure, nothing is recorded while it is
+    disabled.
+    """
+    enabled: bool = False
+    timers: Dict[str, PhaseTimer] = field(default_factory=dict)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def record(self, name: str, elapsed_time: float) -> None:
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = PhaseTimer()
+        timer.calls += 1
+        timer.total_time += elapsed_time
+
+    def reset(self) -> None:
+        self.timers.clear()
+
+    def get_breakdown(self) -> List[Tuple[str, int, float]]:
+        breakdown = [(name, timer.calls, timer.total_time) for name, timer in self.timers.items()]
+        return sorted(breakdown, key=lambda row: row[2], reverse=True)
+
+    def log(self) -> None:
+        for name, calls, total_time in self.get_breakdown():
+            logging.info(f'{name}: {calls} calls takes {total_time} seconds')
+
+    def dump(self, path: str, episode: int) -> None:
+        """ appends the breakdown of the episode to a csv file, the file is recreated by the first episode """
+        with open(path, 'w' if episode == 0 else 'a') as f:
+            if episode == 0:
+                f.write('episode,phase,calls,total time,mean time\n')
+            for name, calls, total_time in self.get_breakdown():
+                f.write(f'{episode},{name},{calls},{total_time},{total_time / calls}\n')
+
+
+instrumentation = Instrumentation()
+
+
+def measure(function):
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not instrumentation.enabled:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            instrumentation.record(name, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,186 @@
+import os
+import argparse
+from typing import List
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+KINEMATICS_COLUMNS = ['x', 'y', 'z', 'x velocity', 'y velocity', 'z velocity', 'x acceleration', 'y acceleration',
+                      'z acceleration', 'energy']
+AGENT_TABLES = {
+    'agent_data': (['action_size', 'state_size', 'epsilon', 'epsilon_min', 'epsilon_decay', 'max_steps_in_episode',
+                    'num_of_episodes', 'alpha', 'gamma'], [10, 10, 0, 0.01, 0.99, 70, 50, 0.001, 0.96]),
+    'data_collection_agent': (['alpha1', 'beta1'], [1, 1]),
+    'data_forward_agent': (['max_delay', 'max_energy', 'max_queue_length', 'beta', 'gamma_e', 'sigma_q', 'lambda_d',
+                            'k'], [10000, 10000, 10000, 1, 1, 1, 1, 1.0e18]),
+    'dqn_data': (['checkpoint_path', 'checkpoint_freq', 'state_dim', 'buffer_size', 'batch_size', 'tau',
+                  'target_update_freq'], ['data/model_data/', 25, 2, 50, 32, 0.2, 20]),
+}
+
+
+@dataclass
+class ScenarioGenerator:
+    """
+    Writes a complete test sample without any interaction, the sensors are placed uniformly (random) or around
+    cluster centers (clustered) and every uav gets its own tour over a vertical strip of the land, either a grid
+    sweep of the strip or a nearest neighbour tour over the occupied grid cells. When land_size is 0 the land grows
+    with the number of sensors to keep about one sensor per square kilometer.
+    """
+    num_of_sensors: int
+    num_of_uavs: int
+    num_of_base_stations: int = 1
+    layout: str = 'random'
+    tour: str = 'sweep'
+    num_of_clusters: int = 0
+    land_size: int = 0
+    coverage_radius: int = 2000
+    speed: int = 375
+    frame_rate: int = 1
+    run_until: int = 100000
+    packet_expiry: bool = False
+    memory_type: str = 'heap'
+    seed: int = 0
+    rng: np.random.Generator = field(init=False, repr=False)
+
+    def __post_init__(self):
+        assert self.layout in ('random', 'clustered'), f'unknown layout {self.layout}'
+        assert self.tour in ('sweep', 'nearest'), f'unknown tour {self.tour}'
+        assert self.memory_type in ('heap', 'columnar'), f'unknown memory type {self.memory_type}'
+        self.rng = np.random.default_rng(self.seed)
+        assert self.num_of_uavs > 0, f'at least one uav is needed, got {self.num_of_uavs}'
+        assert self.coverage_radius > 0, f'coverage radius must be positive, got {self.coverage_radius}'
+        assert self.land_size >= 0, f'land size must be positive or 0 to size it by the sensors, got {self.land_size}'
+        if self.land_size == 0:
+            self.land_size = int(1000 * np.sqrt(self.num_of_sensors)) + 1000
+        if self.num_of_clusters == 0:
+            self.num_of_clusters = max(1, int(np.sqrt(self.num_of_sensors)))
+
+    def generate_sensors(self) -> np.ndarray:
+        if self.layout == 'random':
+            positions = self.rng.uniform(0, self.land_size, (self.num_of_sensors, 2))
+        else:
+            centers = self.rng.uniform(0, self.land_size, (self.num_of_clusters, 2))
+            labels = self.rng.integers(0, self.num_of_clusters, self.num_of_sensors)
+            positions = centers[labels] + self.rng.normal(0, self.coverage_radius, (self.num_of_sensors, 2))
+            positions = positions.clip(0, self.land_size)
+        return positions.round(1)
+
+    def generate_base_stations(self) -> np.ndarray:
+        if self.num_of_base_stations == 1:
+            return np.array([[self.land_size // 2, self.land_size // 2]])
+        return self.rng.uniform(0, self.land_size, (self.num_of_base_stations, 2)).astype(int)
+
+    def get_cell_size(self) -> int:
+        return 2 * self.coverage_radius
+
+    def get_strip(self, uav_index: int) -> tuple:
+        strip_width = self.land_size / self.num_of_uavs
+        return strip_width * uav_index, strip_width * (uav_index + 1)
+
+    def generate_sweep_tour(self, uav_index: int) -> np.ndarray:
+        """ boustrophedon over the centers of the grid cells of the uav strip """
+        left, right = self.get_strip(uav_index)
+        cell_size = self.get_cell_size()
+        xs = np.arange(left + cell_size / 2, right, cell_size) if right - left > cell_size else [(left + right) / 2]
+        ys = np.arange(cell_size / 2, self.land_size, cell_size) if self.land_size > cell_size / 2 \
+            else [self.land_size / 2]
+        tour = []
+        for column, x in enumerate(xs):
+            for y in (ys if column % 2 == 0 else ys[::-1]):
+                tour.append((x, y))
+        return np.array(tour).astype(int)
+
+    def generate_nearest_tour(self, uav_index: int, sensors: np.ndarray) -> np.ndarray:
+        """ nearest neighbour tour over the centroids of the occupied grid cells of the uav strip """
+        left, right = self.get_strip(uav_index)
+        in_strip = sensors[(sensors[:, 0] >= left) & ((sensors[:, 0] < right) | (uav_index == self.num_of_uavs - 1))]
+        if len(in_strip) == 0:
+            return np.array([((left + right) / 2, self.land_size / 2)]).astype(int)
+        cells = (in_strip // self.get_cell_size()).astype(int)
+        _, labels = np.unique(cells, axis=0, return_inverse=True)
+        labels = labels.reshape(-1)
+        stops = np.array([in_strip[labels == label].mean(axis=0) for label in range(labels.max() + 1)])
+        remaining = np.ones(len(stops), dtype=bool)
+        current = int(np.argmin(stops[:, 1]))
+        tour = []
+        while True:
+            tour.append(stops[current])
+            remaining[current] = False
+            if not remaining.any():
+                break
+            distances = np.where(remaining, ((stops - stops[current]) ** 2).sum(axis=1), np.inf)
+            current = int(np.argmin(distances))
+        return np.array(tour).astype(int)
+
+    def generate_tours(self, sensors: np.ndarray) -> List[np.ndarray]:
+        if self.tour == 'sweep':
+            return [self.generate_sweep_tour(uav_index) for uav_index in range(self.num_of_uavs)]
+        return [self.generate_nearest_tour(uav_index, sensors) for uav_index in range(self.num_of_uavs)]
+
+    @staticmethod
+    def write_table(output_dir: str, name: str, columns: list, rows: list) -> None:
+        pd.DataFrame(rows, columns=columns).to_csv(os.path.join(output_dir, f'{name}.csv'), index=False)
+
+    def write(self, output_dir: str) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+        kinematics = [0] * 6
+        sensors = self.generate_sensors()
+        base_stations = self.generate_base_stations()
+        tours = self.generate_tours(sensors)
+        self.write_table(output_dir, 'environment_basics', ['height', 'width', 'frame rate', 'run until'],
+                         [[self.land_size, self.land_size, self.frame_rate, self.run_until]])
+        self.write_table(output_dir, 'energy_model',
+                         ['e_elec', 'distance_threshold', 'power_amplifier_for_fs', 'power_amplifier_for_amp'],
+                         [[5.0e-08, 4500, 1.0e-12, 1.3e-12]])
+        self.write_table(output_dir, 'memory_models',
+                         ['buffer size', 'buffer io speed', 'memory size', 'memory io speed', 'memory type'],
+                         [[640, 32, 640, 32, 'heap'], [2560000] * 4 + [self.memory_type],
+                          [12800, 1280, 128000, 2560, self.memory_type]])
+        self.write_table(output_dir, 'network_models', ['bandwidth', 'coverage radius', 'data loss percentage',
+                                                        'data loss probability', 'data init size'],
+                         [[0, 0, 0, 0, 10], [500000, self.coverage_radius, 20, 1, 8],
+                          [500000, self.coverage_radius, 10, 30, 10]])
+        self.write_table(output_dir, 'sensors', KINEMATICS_COLUMNS + ['data collecting rate', 'sampling rate',
+                                                                      'packet size', 'packet life time',
+                                                                      'packet expiry'],
+                         [[x, y, 0, *kinematics, 0, 2880, 32, 4, 100, int(self.packet_expiry)] for x, y in sensors])
+        self.write_table(output_dir, 'base_stations', KINEMATICS_COLUMNS,
+                         [[x, y, 0, *kinematics, 100000] for x, y in base_stations])
+        self.write_table(output_dir, 'uavs', KINEMATICS_COLUMNS + ['speed'],
+                         [[tour[0][0], tour[0][1], 0, *kinematics, 100, self.speed] for tour in tours])
+        self.write_table(output_dir, 'way_points', ['uav id', 'x', 'y', 'z', 'collection rate'],
+                         [[uav_id, x, y, 0, 0] for uav_id, tour in enumerate(tours, start=1) for x, y in tour])
+        for name, (columns, row) in AGENT_TABLES.items():
+            self.write_table(output_dir, name, columns, [row])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('solution_id', type=int)
+    parser.add_argument('num_of_sensors', type=int)
+    parser.add_argument('num_of_uavs', type=int)
+    parser.add_argument('--num-of-base-stations', type=int, default=1)
+    parser.add_argument('--layout', choices=['random', 'clustered'], default='random')
+    parser.add_argument('--tour', choices=['sweep', 'nearest'], default='sweep')
+    parser.add_argument('--num-of-clusters', type=int, default=0)
+    parser.add_argument('--land-size', type=int, default=0)
+    parser.add_argument('--coverage-radius', type=int, default=2000)
+    parser.add_argument('--packet-expiry', action='store_true')
+    parser.add_argument('--memory-type', choices=['heap', 'columnar'], default='heap')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args()
+    output_dir = f'data/input/test_sample_{args.solution_id}'
+    if os.path.exists(output_dir) and not args.overwrite:
+        raise FileExistsError(f'{output_dir} already exists, use --overwrite to replace it')
+    generator = ScenarioGenerator(num_of_sensors=args.num_of_sensors, num_of_uavs=args.num_of_uavs,
+                                  num_of_base_stations=args.num_of_base_stations, layout=args.layout,
+                                  tour=args.tour, num_of_clusters=args.num_of_clusters, land_size=args.land_size,
+                                  coverage_radius=args.coverage_radius, packet_expiry=args.packet_expiry,
+                                  memory_type=args.memory_type, seed=args.seed)
+    generator.write(output_dir)
+
+
+if __name__ == '__main__':
+    main()
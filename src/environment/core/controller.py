@@ -1,28 +1,31 @@
 import numpy as np
 
-from typing import List
+from typing import List, Tuple
 from dataclasses import dataclass, field
 
 from src.data.logger import configure_logger
+from src.data.instrumentation import instrumentation
 from src.data.file_manager import FileManager
+from src.environment.core.environment import Environment
+from src.environment.core.vectorized_environment import VectorizedEnvironment
 from src.presentation.plot_view import PlotEnvironment
 
 from src.rl.data_collecting.data_collecting_agent import DataCollectingAgent
 from src.rl.data_forwarding.data_forwarding_agent import DataForwardingAgent
 from src.rl.rl_agents_controller import RLAgentController
+from src.rl.batched_agents_controller import BatchedAgentController
+from src.rl.parallel_agents_controller import ParallelAgentController
 
 
 @dataclass
 class EnvironmentController:
     agents: List = field(default_factory=list)
+    max_steps = 400
 
     @staticmethod
-    def run(solution_id: int, num_of_episodes: int, run_type: str, log_on_file=True) -> None:
-        configure_logger(write_on_file=log_on_file)
-        file = FileManager(solution_id)
+    def create_agents(env: Environment) -> Tuple[List[DataForwardingAgent], List[DataCollectingAgent]]:
         forwarding_agents = []
         collecting_agents = []
-        env = file.load_environment()
         for uav in env.uavs:
             forwarding_agent = DataForwardingAgent(uav=uav, epsilon_decay=0.995, gamma=0.95, target_update_freq=2,
                                                    checkpoint_path='data/model/checkpoints', checkpoint_freq=1000,
@@ -32,16 +35,43 @@ class EnvironmentController:
             collecting_agent = DataCollectingAgent(uav=uav)
             forwarding_agents.append(forwarding_agent)
             collecting_agents.append(collecting_agent)
-        agents_controller = RLAgentController(environment=env, forwarding_agents=forwarding_agents, max_steps=400,
+        return forwarding_agents, collecting_agents
+
+    @staticmethod
+    def run(solution_id: int, num_of_episodes: int, run_type: str, log_on_file=True, event_driven=False,
+            num_of_environments=1, num_of_workers=0, instrument=False, flow_level=False,
+            sensing=False) -> None:
+        configure_logger(write_on_file=log_on_file)
+        if instrument:
+            instrumentation.enable()
+        file = FileManager(solution_id)
+        env = file.load_environment(event_driven=event_driven, flow_level=flow_level, sensing=sensing)
+        forwarding_agents, collecting_agents = EnvironmentController.create_agents(env)
+        agents_controller = RLAgentController(environment=env, forwarding_agents=forwarding_agents,
+                                              max_steps=EnvironmentController.max_steps,
                                               collecting_agents=collecting_agents)
         if run_type == 'plot':
             plot_environment = PlotEnvironment(env=env, scale=1, close_on_done=True)
             plot_environment.run()
+        elif run_type == 'forward-agent' and num_of_workers > 0:
+            parallel_controller = ParallelAgentController(forwarding_agents=forwarding_agents, solution_id=solution_id,
+                                                          num_of_workers=num_of_workers, event_driven=event_driven,
+                                                          flow_level=flow_level, sensing=sensing,
+                                                          instrument=instrument, max_steps=agents_controller.max_steps)
+            parallel_controller.run_forwarding_agents(num_of_episodes=num_of_episodes)
+        elif run_type == 'forward-agent' and num_of_environments > 1:
+            environments = VectorizedEnvironment.replicate(environment=env, num_of_environments=num_of_environments,
+                                                           max_steps=agents_controller.max_steps)
+            batched_controller = BatchedAgentController(forwarding_agents=forwarding_agents,
+                                                        collecting_agents=collecting_agents, environments=environments)
+            batched_controller.run_forwarding_agents(num_of_episodes=num_of_episodes)
         elif run_type == 'forward-agent':
             agents_controller.run_forwarding_agents(num_of_episodes=num_of_episodes)
         elif run_type == 'console':
             while not env.has_ended():
                 env.step()
+            instrumentation.log()
+            RLAgentController.save_phase_timings(episode=0)
         else:
             raise ValueError('unknown run type!!')
 
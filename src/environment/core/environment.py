@@ -1,13 +1,24 @@
-from typing import List
+import math
+from typing import Dict, List, Optional
 from copy import deepcopy
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from src.data.instrumentation import measure
 from src.environment.core.globals import update_speed_rate, multiply_by_speed_rate
+from src.environment.core.kinematics import KinematicsStore
+from src.environment.core.spatial_index import SpatialGrid
+from src.environment.core.event_queue import EventQueue, EventType
+from src.environment.core.snapshot import EnvironmentSnapshot
+from src.environment.core.random_streams import RandomStreams
 
 from src.environment.devices.sensor import Sensor
 from src.environment.devices.device import Device
 from src.environment.devices.uav import UAV, UAVTask
 from src.environment.devices.base_station import BaseStation
+from src.environment.simulation_models.memory.memory import Memory
+from src.environment.simulation_models.energy.energy_model import EnergyModel
 
 
 @dataclass
@@ -19,18 +30,58 @@ class Environment:
     sensors: List[Sensor] = field(default_factory=list)
     base_stations: List[BaseStation] = field(default_factory=list)
     run_until: int = 100
+    seed: int = 0
+    event_driven: bool = False
+    """ advance the clock straight to the next event instead of one tick per step """
+    flow_level: bool = False
+    """ collect from all the sensors in range as flows worked out together instead of one connection at a time """
+    sensing: bool = False
+    """ sensors keep sampling, their data is derived when a uav collects from them """
     time_step: int = field(init=False, default=0)
+    kinematics: KinematicsStore = field(init=False, default_factory=KinematicsStore)
+    spatial_index: SpatialGrid = field(init=False, default=None)
+    events: EventQueue = field(init=False, default_factory=EventQueue)
+    registries: Dict[type, Dict[int, int]] = field(init=False, default_factory=dict)
+    """ index of every device in the list of its type keyed by the device id """
+    energy_models: List[EnergyModel] = field(init=False, default_factory=list)
+    random_streams: RandomStreams = field(init=False, default=None)
+    """ seeded random streams of the components that run in this environment """
 
     def __post_init__(self) -> None:
-        self.initial_state = deepcopy(self)
         update_speed_rate(self.speed_rate)
+        self.bind_kinematics()
+        self.set_random_streams(RandomStreams(seed=self.seed))
+        self.initial_state = self.get_snapshot()
+        self.schedule_packet_expiry()
+
+    def bind_kinematics(self) -> None:
+        self.kinematics.bind(self.get_device_groups(), cached_types=(UAV,))
+        self.registries = {device_type: {device.id: index for index, device in enumerate(devices)}
+                           for device_type, devices in self.get_device_groups().items()}
+        self.energy_models = self.get_energy_models()
+        cell_size = max((uav.network_model.coverage_radius for uav in self.uavs), default=1)
+        self.spatial_index = SpatialGrid(store=self.kinematics, cell_size=cell_size)
+
+    def set_random_streams(self, random_streams: RandomStreams) -> None:
+        self.random_streams = random_streams
+        for device in self.get_devices():
+            device.network_model.protocol.random_stream = random_streams.get('link loss')
 
-    def run_uav_task(self, uav: UAV) -> None:
+    def move_uavs(self, uavs: List[UAV]) -> None:
+        indices = np.array([uav.kinematics_index for uav in uavs], dtype=int)
+        self.kinematics.move(indices)
+        self.spatial_index.update(indices)
+
+    def advance_uavs(self) -> None:
+        """ the uavs on their way to a way point are placed where their leg puts them at the current time """
+        self.spatial_index.update(self.kinematics.advance(self.time_step))
+
+    @measure
+    def run_uav_task(self, uav: UAV, elapsed_time: int = 1) -> bool:
+        """ returns True if the uav has reached its next way point and has to be moved in this step """
         if uav.steps_to_move > 0:
-            uav.steps_to_move = max(0, uav.steps_to_move - multiply_by_speed_rate(1))
-            if uav.steps_to_move == 0:
-                uav.move_to_next_position()
-            return
+            uav.steps_to_move = max(0, uav.steps_to_move - elapsed_time)
+            return uav.steps_to_move == 0
         can_move = uav.is_active(UAVTask.MOVE)
         if uav.is_active(UAVTask.FORWARD):
             can_move = False
@@ -39,19 +90,126 @@ class Environment:
             can_move = False
         if uav.is_active(UAVTask.COLLECT):
             can_move = False
-            uav.collect_data(self.get_in_range(uav=uav, device_type=Sensor), time_step=self.time_step)
+            sensors = self.get_in_range(uav=uav, device_type=Sensor)
+            if self.sensing:
+                self.sense(sensors)
+            uav.collect_data(sensors, time_step=self.time_step, flow_level=self.flow_level)
         if can_move:
             uav.update_velocity()
+            if uav.steps_to_move > 0:
+                self.kinematics.start_leg(uav.kinematics_index, self.time_step, uav.steps_to_move)
+            if self.event_driven and uav.steps_to_move > 0:
+                self.schedule_way_point_arrival(uav)
+        return False
+
+    def schedule_way_point_arrival(self, uav: UAV) -> None:
+        """ the arrival only bounds the jump of the clock, run_uav_task moves the uav when it runs out of steps """
+        ticks = math.ceil(uav.steps_to_move / multiply_by_speed_rate(1))
+        self.events.schedule(self.time_step + multiply_by_speed_rate(ticks), EventType.WAY_POINT_ARRIVAL, uav)
+
+    def get_energy_models(self) -> List[EnergyModel]:
+        energy_models = {}
+        for device in self.get_devices():
+            energy_models.setdefault(id(device.energy_model), device.energy_model)
+        return list(energy_models.values())
+
+    def account_energy(self) -> None:
+        """ the transfers of a step are accounted together before the uavs move away from where they happened """
+        for energy_model in self.energy_models:
+            energy_model.flush(self.kinematics)
+
+    def sense(self, sensors: List[Sensor]) -> None:
+        """ brings the data of the sensors up to the current time and drops what expired in their memories """
+        memory_models = {}
+        for sensor in sensors:
+            sensor.sense(self.time_step)
+            memory_models.setdefault(id(sensor.memory_model), sensor.memory_model)
+        for memory_model in memory_models.values():
+            memory_model.remove_expired_packets(self.time_step)
+
+    def schedule_next_expiry(self, device: Device) -> None:
+        expiry_time = device.memory_model.get_next_expiry_time()
+        if expiry_time is not None:
+            self.events.schedule(expiry_time, EventType.PACKET_EXPIRY, device)
+
+    def schedule_packet_expiry(self) -> None:
+        """ sensors are not stepped, so the packets in their memories expire through scheduled events """
+        devices = {}
+        for sensor in self.sensors:
+            devices.setdefault(id(sensor.memory_model), sensor)
+        for device in devices.values():
+            self.schedule_next_expiry(device)
+
+    def expire_packets(self, device: Device) -> None:
+        device.memory_model.remove_expired_packets(self.time_step)
+        self.schedule_next_expiry(device)
 
+    def has_pending_transfers(self) -> bool:
+        for uav in self.uavs:
+            if uav.steps_to_move == 0 and uav.has_active_tasks():
+                return True
+            if uav.memory_model.receiving_buffer.has_data():
+                return True
+        for base_station in self.base_stations:
+            if base_station.memory_model.receiving_buffer.has_data():
+                return True
+        return False
+
+    def get_next_range_change(self, until: int) -> Optional[float]:
+        """
+        earliest time before until at which a uav on its way to a way point enters or leaves the range of a uav or a
+        base station, the targets a uav can forward to change at that time.
+        """
+        uavs = self.kinematics.get_slice(UAV)
+        targets = np.r_[uavs, self.kinematics.get_slice(BaseStation)]
+        indices, other_indices = np.repeat(np.r_[uavs], len(targets)), np.tile(targets, uavs.stop - uavs.start)
+        radii = np.repeat([uav.network_model.coverage_radius for uav in self.uavs], len(targets)).astype(float)
+        on_leg = self.kinematics.durations > 0
+        pairs = (indices != other_indices) & (on_leg[indices] | on_leg[other_indices])
+        if not pairs.any():
+            return None
+        return self.kinematics.get_first_range_crossing(indices[pairs], other_indices[pairs], radii[pairs],
+                                                        self.time_step, until)
+
+    def get_ticks_to_next_event(self) -> int:
+        """
+        tasks, transfers and buffers that still hold data progress every tick, otherwise nothing changes until the next
+        scheduled event or until a moving uav changes what is in range, so the clock can jump straight to it. the jump
+        stops at the last tick before a range change, the tick after it is taken by the next step. transfers and tasks
+        are not scheduled as events, when they end depends on link losses, buffer space and io speeds tick by tick and
+        the agents decide again after every step, so while any of them is pending the clock advances one tick at a time.
+        """
+        if not self.event_driven or self.has_pending_transfers():
+            return 1
+        next_time = self.events.get_next_time()
+        if next_time is None:
+            return 1
+        next_time = min(next_time, self.run_until)
+        range_change = self.get_next_range_change(next_time)
+        if range_change is not None:
+            return max(1, math.floor((range_change - self.time_step) / multiply_by_speed_rate(1)))
+        return max(1, math.ceil((next_time - self.time_step) / multiply_by_speed_rate(1)))
+
+    @measure
     def step(self) -> None:
-        self.time_step += multiply_by_speed_rate(1)
+        elapsed_time = multiply_by_speed_rate(self.get_ticks_to_next_event())
+        self.time_step += elapsed_time
+        for event in self.events.pop_until(self.time_step):
+            # way point arrivals are only scheduled to stop the jump at them, there is nothing to handle
+            if event.event_type == EventType.PACKET_EXPIRY:
+                self.expire_packets(event.device)
+        self.advance_uavs()
         # for sensor in self.sensors:
         #     sensor.step(current_time=self.time_step)
         for base_station in self.base_stations:
-            base_station.step(current_time=self.time_step)
+            base_station.step(current_time=self.time_step, time_step_size=elapsed_time)
+        arrived_uavs = []
         for uav in self.uavs:
-            uav.step(current_time=self.time_step)
-            self.run_uav_task(uav)
+            uav.step(current_time=self.time_step, time_step_size=elapsed_time)
+            if self.run_uav_task(uav, elapsed_time):
+                arrived_uavs.append(uav)
+        self.account_energy()
+        self.move_uavs(arrived_uavs)
 
     def has_ended(self) -> bool:
         done = True
@@ -61,24 +219,75 @@ class Environment:
                 break
         return self.time_step >= self.run_until or done
 
+    def copy(self) -> 'Environment':
+        environment = deepcopy(self)
+        environment.bind_kinematics()
+        return environment
+
+    def get_device_groups(self) -> Dict[type, List[Device]]:
+        return {UAV: self.uavs, Sensor: self.sensors, BaseStation: self.base_stations}
+
+    def get_index(self, device: Device) -> int:
+        """ index of the device in the list of its type """
+        return self.registries[type(device)][device.id]
+
+    def get_devices(self) -> List[Device]:
+        return [*self.uavs, *self.sensors, *self.base_stations]
+
+    def get_memories(self) -> List[Memory]:
+        memories = {}
+        for device in self.get_devices():
+            for memory in device.memory_model.get_memories():
+                memories.setdefault(id(memory), memory)
+        return list(memories.values())
+
+    def get_snapshot(self) -> EnvironmentSnapshot:
+        return EnvironmentSnapshot(time_step=self.time_step, positions=self.kinematics.positions.copy(),
+                                   velocities=self.kinematics.velocities.copy(),
+                                   accelerations=self.kinematics.accelerations.copy(),
+                                   origins=self.kinematics.origins.copy(),
+                                   start_times=self.kinematics.start_times.copy(),
+                                   durations=self.kinematics.durations.copy(),
+                                   devices=[device.get_snapshot() for device in self.get_devices()],
+                                   memories=[memory.get_snapshot() for memory in self.get_memories()])
+
+    def restore_snapshot(self, snapshot: EnvironmentSnapshot) -> None:
+        self.time_step = snapshot.time_step
+        self.events.clear()
+        for energy_model in self.energy_models:
+            energy_model.clear()
+        self.kinematics.positions[:] = snapshot.positions
+        self.kinematics.velocities[:] = snapshot.velocities
+        self.kinematics.accelerations[:] = snapshot.accelerations
+        self.kinematics.origins[:] = snapshot.origins
+        self.kinematics.start_times[:] = snapshot.start_times
+        self.kinematics.durations[:] = snapshot.durations
+        self.kinematics.invalidate_distances()
+        for device, device_snapshot in zip(self.get_devices(), snapshot.devices):
+            device.restore_snapshot(device_snapshot)
+        for memory, memory_snapshot in zip(self.get_memories(), snapshot.memories):
+            memory.restore_snapshot(memory_snapshot)
+        self.spatial_index.build()
+        self.schedule_packet_expiry()
+        if self.event_driven:
+            for uav in self.uavs:
+                if uav.steps_to_move > 0:
+                    self.schedule_way_point_arrival(uav)
+
     def reset(self) -> None:
-        self.time_step = 0
-        self.uavs = deepcopy(self.initial_state.uavs)
-        self.sensors = deepcopy(self.initial_state.sensors)
-        self.base_stations = deepcopy(self.initial_state.base_stations)
+        self.restore_snapshot(self.initial_state)
 
     def get_in_range(self, uav: UAV, device_type: type) -> List[Device]:
-        neighbours = []
         if device_type == UAV:
             lookup_list = self.uavs
         elif device_type == Sensor:
             lookup_list = self.sensors
         else:
             lookup_list = self.base_stations
-        for device in lookup_list:
-            if uav != device and uav.in_range(device):
-                neighbours.append(device)
-        return neighbours
+            device_type = BaseStation
+        start = self.kinematics.get_slice(device_type).start
+        indices = self.spatial_index.query(uav.kinematics_index, device_type, uav.network_model.coverage_radius)
+        return [lookup_list[index - start] for index in indices if lookup_list[index - start] is not uav]
 
     # def get_data_way_points_variance(self, uav: UAV):
     #     data = []
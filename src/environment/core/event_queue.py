@@ -0,0 +1,48 @@
+from enum import Enum
+from typing import Any, List, Optional
+from dataclasses import dataclass, field
+
+from src.environment.utils.priority_queue import PriorityQueue
+
+
+class EventType(Enum):
+    WAY_POINT_ARRIVAL = 0
+    PACKET_EXPIRY = 1
+
+
+@dataclass(order=True)
+class Event:
+    time: int
+    sequence: int
+    event_type: EventType = field(compare=False)
+    device: Any = field(compare=False, default=None)
+
+
+@dataclass
+class EventQueue:
+    events: PriorityQueue = field(init=False, default_factory=PriorityQueue)
+    sequence: int = field(init=False, default=0)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def schedule(self, time: int, event_type: EventType, device: Any = None) -> Event:
+        event = Event(time=time, sequence=self.sequence, event_type=event_type, device=device)
+        self.sequence += 1
+        self.events.push(event)
+        return event
+
+    def get_next_time(self) -> Optional[int]:
+        if self.events.is_empty():
+            return None
+        return self.events.get_item().time
+
+    def pop_until(self, time: int) -> List[Event]:
+        events = []
+        while not self.events.is_empty() and self.events.get_item().time <= time:
+            events.append(self.events.pop())
+        return events
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.sequence = 0
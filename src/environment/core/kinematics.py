@@ -0,0 +1,177 @@
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.environment.devices.physical_object import PhysicalObject
+
+
+@dataclass
+class KinematicsStore:
+    """
+    Struct of arrays holding the position, velocity and acceleration of every device in the environment. devices are
+    stored contiguously by type, the position, velocity and acceleration vectors of each device are views into the
+    rows of these arrays. the distances from a device of the cached types to every device are cached as a row until it
+    moves, a move only recomputes the rows of the moved devices and their columns in the other cached rows, so the rows
+    of the devices that stay still are kept across steps. the distances between devices that have no cached row are
+    computed from their positions when they are asked for.
+    a device can follow a straight leg, its velocity being the whole displacement of the leg, from its origin at the
+    start time to the end of the leg after duration time, so its position at any time is evaluated in closed form.
+    """
+    positions: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    velocities: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    accelerations: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    slices: Dict[type, slice] = field(default_factory=dict)
+    distance_rows: Dict[int, np.ndarray] = field(default_factory=dict, repr=False)
+    cached_rows: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool), repr=False)
+    """ whether the distance row of every device is cached """
+    origins: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    start_times: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    durations: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    """ the duration of the current leg of every device, 0 when it is not on a leg """
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def bind(self, groups: Dict[type, List[PhysicalObject]], cached_types: Tuple[type, ...] = ()) -> None:
+        size = sum(len(objects) for objects in groups.values())
+        self.positions = np.zeros((size, 3))
+        self.velocities = np.zeros((size, 3))
+        self.accelerations = np.zeros((size, 3))
+        self.origins = np.zeros((size, 3))
+        self.start_times = np.zeros(size)
+        self.durations = np.zeros(size)
+        self.cached_rows = np.zeros(size, dtype=bool)
+        self.slices.clear()
+        self.distance_rows.clear()
+        start = 0
+        for object_type, objects in groups.items():
+            self.slices[object_type] = slice(start, start + len(objects))
+            self.cached_rows[self.slices[object_type]] = object_type in cached_types
+            for index, physical_object in enumerate(objects, start=start):
+                physical_object.bind_kinematics(self, index)
+            start += len(objects)
+
+    def get_slice(self, object_type: type) -> slice:
+        return self.slices.get(object_type, slice(0, 0))
+
+    def move(self, indices: np.ndarray, delta_t: int = 1) -> None:
+        if len(indices) == 0:
+            return
+        on_leg = indices[self.durations[indices] > 0]
+        self.positions[on_leg] = self.origins[on_leg]
+        self.durations[indices] = 0
+        self.velocities[indices] += self.accelerations[indices] * delta_t
+        self.positions[indices] += self.velocities[indices] * delta_t
+        self.invalidate_distances(indices)
+
+    def start_leg(self, index: int, start_time: int, duration: int) -> None:
+        self.origins[index] = self.positions[index]
+        self.start_times[index] = start_time
+        self.durations[index] = duration
+
+    def get_positions_at(self, indices: np.ndarray, time: int) -> np.ndarray:
+        """ positions of the devices on a leg at the given time, the end of the leg once it is over """
+        progress = np.clip((time - self.start_times[indices]) / self.durations[indices], 0, 1)
+        return self.origins[indices] + self.velocities[indices] * progress[:, np.newaxis]
+
+    def get_positions_at_time(self, indices: np.ndarray, time: np.ndarray) -> np.ndarray:
+        """ positions of any devices at the given times, the devices that are not on a leg stay where they are """
+        time = np.broadcast_to(time, len(indices))
+        positions = self.positions[indices].copy()
+        on_leg = self.durations[indices] > 0
+        positions[on_leg] = self.get_positions_at(indices[on_leg], time[on_leg])
+        return positions
+
+    def get_velocities_at_time(self, indices: np.ndarray, time: np.ndarray) -> np.ndarray:
+        """ displacement per time unit of the devices at the given times, zero outside of their legs """
+        durations = self.durations[indices]
+        start_times = self.start_times[indices]
+        moving = (durations > 0) & (start_times <= time) & (time < start_times + durations)
+        velocities = np.zeros((len(indices), 3))
+        velocities[moving] = self.velocities[indices[moving]] / durations[moving, np.newaxis]
+        return velocities
+
+    def get_first_range_crossing(self, indices: np.ndarray, other_indices: np.ndarray, radii: np.ndarray,
+                                 start_time: int, end_time: int) -> Optional[float]:
+        """
+        earliest time in [start_time, end_time] at which the distance between a pair of devices crosses the radius of
+        the pair, None if no pair crosses it. a device moves at a constant velocity until the end of its leg and then
+        stays, so the distance of a pair is solved in closed form between the ends of the legs of the pair.
+        """
+        ends = np.clip(self.start_times + self.durations, start_time, end_time)
+        bounds = [np.full(len(indices), float(start_time)), *np.sort([ends[indices], ends[other_indices]], axis=0),
+                  np.full(len(indices), float(end_time))]
+        first_crossing = np.full(len(indices), np.inf)
+        for lower, upper in zip(bounds[:-1], bounds[1:]):
+            middle = (lower + upper) / 2
+            offsets = self.get_positions_at_time(indices, lower) - self.get_positions_at_time(other_indices, lower)
+            velocities = self.get_velocities_at_time(indices, middle) - self.get_velocities_at_time(other_indices,
+                                                                                                      middle)
+            a = np.einsum('ij,ij->i', velocities, velocities)
+            b = 2 * np.einsum('ij,ij->i', offsets, velocities)
+            c = np.einsum('ij,ij->i', offsets, offsets) - radii ** 2
+            discriminant = b ** 2 - 4 * a * c
+            solvable = (a > 0) & (discriminant >= 0)
+            root = np.sqrt(np.where(solvable, discriminant, 0))
+            safe_a = np.where(solvable, a, 1)
+            for delay in ((-b - root) / (2 * safe_a), (-b + root) / (2 * safe_a)):
+                crossing = solvable & (delay >= 0) & (lower + delay <= upper)
+                first_crossing = np.where(crossing, np.minimum(first_crossing, lower + delay), first_crossing)
+        time = first_crossing.min(initial=np.inf)
+        return None if np.isinf(time) else float(time)
+
+    def advance(self, time: int) -> np.ndarray:
+        """ places every device on a leg where the leg puts it at the given time and returns their indices """
+        indices = np.flatnonzero(self.durations > 0)
+        if len(indices) == 0:
+            return indices
+        self.positions[indices] = self.get_positions_at(indices, time)
+        self.invalidate_distances(indices)
+        return indices
+
+    def invalidate_distances(self, indices: np.ndarray = None) -> None:
+        """ drops the cached distances of the moved devices, all the cached distances if indices is None """
+        if indices is None:
+            self.distance_rows.clear()
+            return
+        for index in indices:
+            self.distance_rows.pop(int(index), None)
+        if len(self.distance_rows) == 0:
+            return
+        rows = np.fromiter(self.distance_rows.keys(), dtype=int, count=len(self.distance_rows))
+        diff = self.positions[indices][np.newaxis, :, :] - self.positions[rows][:, np.newaxis, :]
+        distances = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+        for row, row_distances in zip(self.distance_rows.values(), distances):
+            row[indices] = row_distances
+
+    def get_distance_row(self, index: int) -> np.ndarray:
+        """ distances from index to every device, the returned row must not be modified """
+        row = self.distance_rows.get(index)
+        if row is None:
+            diff = self.positions - self.positions[index]
+            row = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+            if self.cached_rows[index]:
+                self.distance_rows[index] = row
+        return row
+
+    def get_distances_to(self, index: int, other_indices: np.ndarray) -> np.ndarray:
+        """ distances from index to the devices of other_indices """
+        if self.cached_rows[index]:
+            return self.get_distance_row(index)[other_indices]
+        diff = self.positions[other_indices] - self.positions[index]
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def get_distance(self, index: int, other_index: int) -> float:
+        if not self.cached_rows[index] and self.cached_rows[other_index]:
+            index, other_index = other_index, index
+        return float(self.get_distances_to(index, np.array([other_index]))[0])
+
+    def get_distances(self, indices: np.ndarray, other_indices: np.ndarray) -> np.ndarray:
+        """ element wise distances between the devices of indices and other_indices """
+        diff = self.positions[indices] - self.positions[other_indices]
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def distances_from(self, index: int, object_type: type) -> np.ndarray:
+        indices = self.get_slice(object_type)
+        return self.get_distances_to(index, np.arange(indices.start, indices.stop))
@@ -0,0 +1,58 @@
+import zlib
+from typing import Dict, List, Sequence, Tuple
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class RandomStream:
+    """
+    Uniform values of one component drawn from its own generator a block at a time, single values are handed out from
+    the block so drawing one costs an index increment.
+    """
+    generator: np.random.Generator
+    block_size: int = 4096
+    block: np.ndarray = field(init=False, default_factory=lambda: np.zeros(0), repr=False)
+    position: int = field(init=False, default=0)
+
+    def random(self) -> float:
+        if self.position >= len(self.block):
+            self.block = self.generator.random(self.block_size)
+            self.position = 0
+        value = self.block[self.position]
+        self.position += 1
+        return float(value)
+
+    def integers(self, low: int, high: int) -> int:
+        """ a random integer in [low, high) """
+        return low + int(self.random() * (high - low))
+
+    def choice(self, items: Sequence):
+        return items[int(self.random() * len(items))]
+
+    def sample(self, population: Sequence, k: int) -> List:
+        """ k distinct items of population """
+        return [population[index] for index in self.generator.choice(len(population), size=k, replace=False)]
+
+
+@dataclass
+class RandomStreams:
+    """
+    Independent seeded streams keyed by component name. the stream of a name depends only on the seed, the spawn key
+    and the name, so it does not shift when other components draw more or fewer values, and the streams of spawned
+    children never overlap with each other or with their parent.
+    """
+    seed: int = 0
+    spawn_key: Tuple[int, ...] = ()
+    streams: Dict[str, RandomStream] = field(init=False, default_factory=dict, repr=False)
+
+    def get(self, name: str) -> RandomStream:
+        stream = self.streams.get(name)
+        if stream is None:
+            seed_sequence = np.random.SeedSequence(self.seed, spawn_key=(*self.spawn_key, zlib.crc32(name.encode())))
+            stream = self.streams[name] = RandomStream(generator=np.random.default_rng(seed_sequence))
+        return stream
+
+    def spawn(self, index: int) -> 'RandomStreams':
+        return RandomStreams(seed=self.seed, spawn_key=(*self.spawn_key, 2 ** 32 + index))
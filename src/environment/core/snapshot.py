@@ -0,0 +1,21 @@
+from typing import Any, List, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class EnvironmentSnapshot:
+    """
+    The mutable state of an environment, restored in place by Environment.restore_snapshot. devices and memories are
+    stored in the order they are visited by Environment.get_devices, a memory shared by many devices is stored once.
+    """
+    time_step: int
+    positions: np.ndarray
+    velocities: np.ndarray
+    accelerations: np.ndarray
+    origins: np.ndarray
+    start_times: np.ndarray
+    durations: np.ndarray
+    devices: List[dict]
+    memories: List[Tuple[int, List[Any]]]
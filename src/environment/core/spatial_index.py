@@ -0,0 +1,75 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.environment.core.kinematics import KinematicsStore
+
+
+@dataclass
+class SpatialGrid:
+    """
+    Uniform grid over the x-y plane that buckets the kinematics indices of every device by cell, the cell size is the
+    largest coverage radius so a range query only visits the cells around the querying device.
+    """
+    store: KinematicsStore
+    cell_size: float
+    cells: Dict[type, Dict[Tuple[int, int], List[int]]] = field(init=False, default_factory=dict)
+    index_cells: Dict[int, Tuple[int, int]] = field(init=False, default_factory=dict)
+    index_types: Dict[int, type] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.cell_size = max(float(self.cell_size), 1.0)
+        self.build()
+
+    def get_cell(self, index: int) -> Tuple[int, int]:
+        position = self.store.positions[index]
+        return int(position[0] // self.cell_size), int(position[1] // self.cell_size)
+
+    def build(self) -> None:
+        self.cells.clear()
+        self.index_cells.clear()
+        self.index_types.clear()
+        for object_type, indices in self.store.slices.items():
+            cells = defaultdict(list)
+            for index in range(indices.start, indices.stop):
+                cell = self.get_cell(index)
+                cells[cell].append(index)
+                self.index_cells[index] = cell
+                self.index_types[index] = object_type
+            self.cells[object_type] = cells
+
+    def update(self, indices) -> None:
+        for index in indices:
+            index = int(index)
+            old_cell = self.index_cells[index]
+            new_cell = self.get_cell(index)
+            if old_cell == new_cell:
+                continue
+            cells = self.cells[self.index_types[index]]
+            cells[old_cell].remove(index)
+            if len(cells[old_cell]) == 0:
+                del cells[old_cell]
+            cells[new_cell].append(index)
+            self.index_cells[index] = new_cell
+
+    def query(self, index: int, object_type: type, radius: float) -> np.ndarray:
+        """ returns the sorted kinematics indices of the devices of the given type within radius of index """
+        cells = self.cells.get(object_type)
+        if not cells:
+            return np.zeros(0, dtype=int)
+        x, y = self.get_cell(index)
+        reach = max(1, math.ceil(radius / self.cell_size))
+        candidates = []
+        for i in range(x - reach, x + reach + 1):
+            for j in range(y - reach, y + reach + 1):
+                bucket = cells.get((i, j))
+                if bucket:
+                    candidates.extend(bucket)
+        if len(candidates) == 0:
+            return np.zeros(0, dtype=int)
+        candidates = np.array(candidates, dtype=int)
+        in_range = self.store.get_distances_to(index, candidates) <= radius
+        return np.sort(candidates[in_range])
@@ -0,0 +1,54 @@
+from typing import List
+from dataclasses import dataclass, field
+
+from src.environment.core.environment import Environment
+
+
+@dataclass
+class VectorizedEnvironment:
+    """
+    Holds independent copies of the same scenario and steps them together, every copy is reset on its own as soon as
+    its episode ends.
+    """
+    environments: List[Environment]
+    max_steps: int
+    steps: List[int] = field(init=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.steps = [0] * len(self.environments)
+
+    def __len__(self) -> int:
+        return len(self.environments)
+
+    def __getitem__(self, index: int) -> Environment:
+        return self.environments[index]
+
+    @staticmethod
+    def replicate(environment: Environment, num_of_environments: int, max_steps: int) -> 'VectorizedEnvironment':
+        environments = [environment]
+        for index in range(1, num_of_environments):
+            copy = environment.copy()
+            copy.set_random_streams(environment.random_streams.spawn(index))
+            environments.append(copy)
+        return VectorizedEnvironment(environments=environments, max_steps=max_steps)
+
+    def has_ended(self, index: int) -> bool:
+        return self.environments[index].has_ended() or self.steps[index] > self.max_steps
+
+    def get_ended(self) -> List[int]:
+        return [index for index in range(len(self.environments)) if self.has_ended(index)]
+
+    def step(self) -> None:
+        for index, environment in enumerate(self.environments):
+            if self.has_ended(index):
+                continue
+            self.steps[index] += 1
+            environment.step()
+
+    def reset(self, index: int) -> None:
+        self.steps[index] = 0
+        self.environments[index].reset()
+
+    def reset_all(self) -> None:
+        for index in range(len(self.environments)):
+            self.reset(index)
@@ -10,7 +10,7 @@ from src.environment.simulation_models.network.data_transition import TransferTy
 from src.environment.simulation_models.network.network_model import NetworkModel
 
 
-@dataclass(order=True)
+@dataclass(eq=False)
 class Device(PhysicalObject):
     id: int
     memory_model: MemoryModel
@@ -22,10 +22,6 @@ class Device(PhysicalObject):
     def __post_init__(self) -> None:
         self.network_model.center = self.position
 
-    def move_to_next_position(self, delta_t: int = 1) -> None:
-        super().move_to_next_position(delta_t)
-        self.centralize_network()
-
     def centralize_network(self) -> None:
         self.network_model.center = self.position
 
@@ -36,7 +32,10 @@ class Device(PhysicalObject):
         return self.memory_model.read_data()
 
     def get_current_data_size(self) -> int:
-        return sum(packet.size for packet in self.memory_model.read_data())
+        return self.memory_model.get_data_size()
+
+    def get_current_num_of_packets(self) -> int:
+        return self.memory_model.get_num_of_packets()
 
     def consume_energy(self, energy: float) -> None:
         self.consumed_energy += energy
@@ -48,13 +47,21 @@ class Device(PhysicalObject):
                       time_step: int, speed: int = 0) -> DataTransition:
         data_transition = self.network_model.transfer_data(source=self, destination=device, transfer_type=transfer_type,
                                                            data_size=data_size, speed=speed, time_step=time_step)
-        energy = self.energy_model.get_data_transition_energy(data_transition=data_transition)
-        self.consume_energy(energy)
-        device.consume_energy(energy)
+        self.energy_model.record(data_transition)
         return data_transition
 
+    def transfer_flows(self, devices: List['Device'], data_size: int, transfer_type: TransferType,
+                       time_step: int, speed: int = 0) -> List[DataTransition]:
+        """ flow level transfer with all the devices at once, data_size is shared by all of them """
+        data_transitions = self.network_model.transfer_flows(source=self, destinations=devices, data_size=data_size,
+                                                             transfer_type=transfer_type, speed=speed,
+                                                             time_step=time_step)
+        for data_transition in data_transitions:
+            self.energy_model.record(data_transition)
+        return data_transitions
+
     def in_range(self, other: 'Device') -> bool:
-        return self.network_model.in_range(other.position)
+        return self.distance_from(other) <= self.network_model.coverage_radius
 
     def store_data(self, data_packets: List[DataPacket], overwrite=False, time_step=0):
         self.memory_model.store_data(data_packets, overwrite)
@@ -62,6 +69,15 @@ class Device(PhysicalObject):
     def store_data_in_memory(self, data_packets: List[DataPacket], overwrite=False):
         self.memory_model.store_data_in_memory(data_packets, overwrite)
 
+    def get_snapshot(self) -> dict:
+        return {'num_of_collected_packets': self.num_of_collected_packets, 'consumed_energy': self.consumed_energy,
+                'connections': self.network_model.get_snapshot()}
+
+    def restore_snapshot(self, snapshot: dict) -> None:
+        self.num_of_collected_packets = snapshot['num_of_collected_packets']
+        self.consumed_energy = snapshot['consumed_energy']
+        self.network_model.restore_snapshot(snapshot['connections'])
+
     def step(self, current_time: int, time_step_size: int = 1) -> None:
-        self.memory_model.step()
+        self.memory_model.step(current_time)
         self.network_model.step()
@@ -1,15 +1,28 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from src.environment.utils.vector import Vector
 
 
-@dataclass(order=True)
+@dataclass(eq=False)
 class PhysicalObject:
     position: Vector
     velocity: Vector
     acceleration: Vector
+    kinematics_index: int = field(init=False, default=-1, repr=False)
+    kinematics: 'KinematicsStore' = field(init=False, default=None, repr=False)
 
-    def move_to_next_position(self, delta_t: int = 1) -> None:
-        # delta_t *= multiply_by_speed_rate(1)
-        self.velocity = self.velocity + self.acceleration * delta_t
-        self.position = self.position + self.velocity * delta_t
+    def bind_kinematics(self, store, index: int) -> None:
+        store.positions[index] = self.position.data
+        store.velocities[index] = self.velocity.data
+        store.accelerations[index] = self.acceleration.data
+        self.position.data = store.positions[index]
+        self.velocity.data = store.velocities[index]
+        self.acceleration.data = store.accelerations[index]
+        self.kinematics_index = index
+        self.kinematics = store
+
+    def distance_from(self, other: 'PhysicalObject') -> float:
+        """ reads the cached distance when both objects are in the same kinematics store """
+        if self.kinematics is not None and self.kinematics is other.kinematics:
+            return self.kinematics.get_distance(self.kinematics_index, other.kinematics_index)
+        return self.position.distance_from(other.position)
@@ -1,5 +1,4 @@
-from copy import copy
-
+import math
 from dataclasses import dataclass, field
 
 from src.environment.core.globals import multiply_by_speed_rate
@@ -7,7 +6,7 @@ from src.environment.devices.device import Device
 from src.environment.simulation_models.memory.data_packet import DataPacket
 
 
-@dataclass(order=True)
+@dataclass(eq=False)
 class Sensor(Device):
     data_collecting_rate: int
     """ number of collected packets in one timestep """
@@ -16,19 +15,65 @@ class Sensor(Device):
     data_loss: int = field(init=False, default=0)
     """ number of lost packets due to overwrite the sensor data """
     sampling_rate: int = 1
+    packet_expiry: bool = False
+    """ the collected packets expire packet_time_to_live after their collection """
+    last_sensing_time: int = field(init=False, default=0)
+    """ the time up to which the samples of the sensor are in its memory """
 
-    def collect_data(self) -> None:
+    def collect_data(self, current_time: int = 0) -> None:
         num_of_packets = multiply_by_speed_rate(self.data_collecting_rate) // self.packet_size
-        data_packet = DataPacket(life_time=self.packet_time_to_live, size=self.packet_size)
-        # data_packets = [data_packet] * int(num_of_packets)
+        expiry_time = current_time + self.packet_time_to_live if self.packet_expiry else None
         data_packets = []
-        for _ in range(int(num_of_packets)):
-            data_packets.append(copy(data_packet))
+        if num_of_packets > 0:
+            data_packets.append(DataPacket(life_time=self.packet_time_to_live, size=self.packet_size,
+                                           count=int(num_of_packets), expiry_time=expiry_time))
         self.data_loss += max(0, self.data_collecting_rate - self.get_current_data_size())
         self.num_of_collected_packets += self.data_collecting_rate
         super().store_data_in_memory(data_packets, overwrite=True)
 
+    def get_sampling_period(self) -> int:
+        """ the sensor samples at the visited times that are multiples of its sampling rate """
+        return math.lcm(int(self.sampling_rate), multiply_by_speed_rate(1))
+
+    def sense(self, current_time: int) -> None:
+        """
+        catches up on the samples taken since the last time the sensor was read. only the samples that would still be in
+        the memory are materialized, the older ones count as overwritten and the ones past their time to live are
+        counted as collected only.
+        """
+        period = self.get_sampling_period()
+        first_sample = self.last_sensing_time // period + 1
+        last_sample = current_time // period
+        self.last_sensing_time = current_time
+        num_of_samples = last_sample - first_sample + 1
+        if num_of_samples <= 0:
+            return
+        sample_size = int(multiply_by_speed_rate(self.data_collecting_rate) // self.packet_size * self.packet_size)
+        if sample_size == 0:
+            self.num_of_collected_packets += num_of_samples * self.data_collecting_rate
+            return
+        capacity = int(self.memory_model.memory.size // sample_size)
+        kept_samples = min(num_of_samples, capacity)
+        self.data_loss += (num_of_samples - kept_samples) * max(0, self.data_collecting_rate - capacity * sample_size)
+        if self.packet_expiry:
+            first_alive_sample = int((current_time - self.packet_time_to_live) // period) + 1
+            kept_samples = min(kept_samples, max(0, last_sample - first_alive_sample + 1))
+        self.num_of_collected_packets += (num_of_samples - kept_samples) * self.data_collecting_rate
+        for sample in range(last_sample - kept_samples + 1, last_sample + 1):
+            self.collect_data(sample * period)
+
+    def get_snapshot(self) -> dict:
+        snapshot = super().get_snapshot()
+        snapshot['data_loss'] = self.data_loss
+        snapshot['last_sensing_time'] = self.last_sensing_time
+        return snapshot
+
+    def restore_snapshot(self, snapshot: dict) -> None:
+        super().restore_snapshot(snapshot)
+        self.data_loss = snapshot['data_loss']
+        self.last_sensing_time = snapshot['last_sensing_time']
+
     def step(self, current_time: int, time_step_size: int = 1) -> None:
         super().step(current_time, time_step_size)
         if current_time % self.sampling_rate == 0:
-            self.collect_data()
+            self.collect_data(current_time)
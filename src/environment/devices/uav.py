@@ -23,7 +23,7 @@ class WayPoint:
     active: bool = False
 
 
-@dataclass(order=True)
+@dataclass(eq=False)
 class UAV(Device):
     speed: int
     way_points: List[WayPoint] = field(default_factory=list)
@@ -58,12 +58,12 @@ class UAV(Device):
     def update_velocity(self, run_in_loop: bool = False) -> None:
         if not run_in_loop and self.current_way_point + 1 >= len(self.way_points):
             self.deactivate_task(UAVTask.MOVE)
-            self.velocity = Vector(0, 0, 0)
+            self.velocity.set(Vector(0, 0, 0))
             self.steps_to_move = 0
             return
         self.current_way_point += 1
         self.current_way_point %= len(self.way_points)
-        self.velocity = self.way_points[self.current_way_point].position - self.position
+        self.velocity.set(self.way_points[self.current_way_point].position - self.position)
         self.steps_to_move = \
             max(int(self.position.distance_from(self.way_points[self.current_way_point].position) // self.speed), 0)
 
@@ -109,25 +109,56 @@ class UAV(Device):
             return 0
         return self.way_points[self.current_way_point].collection_rate
 
-    def collect_data(self, sensors_in_range: List['Device'], time_step: int) -> List[DataTransition]:
-        data_transition_list = []
+    def update_collection(self, collected_data: int) -> None:
+        way_point = self.way_points[self.current_way_point]
+        way_point.collection_rate = max(0, way_point.collection_rate - collected_data)
+        self.num_of_collected_packets += collected_data
+
+    def collect_data(self, sensors_in_range: List['Device'], time_step: int,
+                     flow_level: bool = False) -> List[DataTransition]:
         speed = self.network_model.bandwidth // (2 * len(sensors_in_range))
-        for sensor in sensors_in_range:
-            data_transition = self.transfer_data(sensor, self.get_current_collection_rate(),
-                                                 transfer_type=TransferType.RECEIVE, time_step=time_step, speed=speed)
-            data_transition_list.append(data_transition)
-            self.way_points[self.current_way_point].collection_rate -= data_transition.size
-            self.way_points[self.current_way_point].collection_rate \
-                = max(0, self.way_points[self.current_way_point].collection_rate)
-            self.num_of_collected_packets += data_transition.size
-            if self.way_points[self.current_way_point].collection_rate == 0:
-                break
+        if flow_level:
+            data_transition_list = self.transfer_flows(sensors_in_range, self.get_current_collection_rate(),
+                                                       transfer_type=TransferType.RECEIVE, time_step=time_step,
+                                                       speed=speed)
+            self.update_collection(sum(data_transition.size for data_transition in data_transition_list))
+        else:
+            data_transition_list = []
+            for sensor in sensors_in_range:
+                data_transition = self.transfer_data(sensor, self.get_current_collection_rate(),
+                                                     transfer_type=TransferType.RECEIVE, time_step=time_step,
+                                                     speed=speed)
+                data_transition_list.append(data_transition)
+                self.update_collection(data_transition.size)
+                if self.way_points[self.current_way_point].collection_rate == 0:
+                    break
         if self.get_current_collection_rate() <= 0:
             self.way_points[self.current_way_point].active = False
             if self.is_active(UAVTask.COLLECT):
                 self.deactivate_task(UAVTask.COLLECT)
         return data_transition_list
 
+    def get_snapshot(self) -> dict:
+        snapshot = super().get_snapshot()
+        snapshot.update({'current_way_point': self.current_way_point, 'steps_to_move': self.steps_to_move,
+                         'data_to_forward': self.data_to_forward, 'forward_data_target': self.forward_data_target,
+                         'tasks': dict(self.tasks), 'data_transitions': list(self.data_transitions),
+                         'way_points': [(way_point.collection_rate, way_point.active)
+                                        for way_point in self.way_points]})
+        return snapshot
+
+    def restore_snapshot(self, snapshot: dict) -> None:
+        super().restore_snapshot(snapshot)
+        self.current_way_point = snapshot['current_way_point']
+        self.steps_to_move = snapshot['steps_to_move']
+        self.data_to_forward = snapshot['data_to_forward']
+        self.forward_data_target = snapshot['forward_data_target']
+        self.tasks = dict(snapshot['tasks'])
+        self.data_transitions = list(snapshot['data_transitions'])
+        for way_point, (collection_rate, active) in zip(self.way_points, snapshot['way_points']):
+            way_point.collection_rate = collection_rate
+            way_point.active = active
+
     def has_active_tasks(self) -> bool:
         for v in self.tasks.values():
             if v > 0:
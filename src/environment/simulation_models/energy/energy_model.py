@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
 
 from src.environment.simulation_models.network.data_transition import DataTransition
 
@@ -9,16 +12,46 @@ class EnergyModel:
     distance_threshold: float
     power_amplifier_for_fs: float
     power_amplifier_for_amp: float
+    pending_transitions: List[DataTransition] = field(init=False, default_factory=list, repr=False)
+    """ transitions of the current step whose energy is not accounted yet """
 
-    def get_data_transition_energy(self, data_transition: DataTransition) -> float:
-        k = data_transition.size
-        distance = data_transition.source.position.distance_from(data_transition.destination.position)
-        if distance < self.distance_threshold:
-            e_t = k * (self.e_elec + self.power_amplifier_for_fs * (distance ** 2))
-        else:
-            e_t = k * (self.e_elec + self.power_amplifier_for_amp * (distance ** 4))
-        e_r = k * self.e_elec
+    def get_transitions_energy(self, distances: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """ transmit plus receive energy of every transition, free space below the distance threshold and multipath
+        above it """
+        amplifier = np.where(distances < self.distance_threshold,
+                             self.power_amplifier_for_fs * (distances ** 2),
+                             self.power_amplifier_for_amp * (distances ** 4))
+        e_t = sizes * (self.e_elec + amplifier)
+        e_r = sizes * self.e_elec
         energy = e_t + e_r
         energy /= 1e4
-        energy = int(energy)
-        return energy
+        return energy.astype(np.int64)
+
+    def record(self, data_transition: DataTransition) -> None:
+        self.pending_transitions.append(data_transition)
+
+    def flush(self, kinematics: 'KinematicsStore') -> None:
+        """
+        accounts the energy of all the recorded transitions in one pass, both ends of a transition consume its energy.
+        the energies are summed per device over the devices involved only.
+        """
+        if not self.pending_transitions:
+            return
+        transitions, self.pending_transitions = self.pending_transitions, []
+        sources = np.fromiter((transition.source.kinematics_index for transition in transitions), dtype=int,
+                              count=len(transitions))
+        destinations = np.fromiter((transition.destination.kinematics_index for transition in transitions), dtype=int,
+                                   count=len(transitions))
+        sizes = np.fromiter((transition.size for transition in transitions), dtype=float, count=len(transitions))
+        energies = self.get_transitions_energy(kinematics.get_distances(sources, destinations), sizes)
+        indices, positions = np.unique(np.concatenate([sources, destinations]), return_inverse=True)
+        consumed_energy = np.bincount(positions, weights=np.concatenate([energies, energies]), minlength=len(indices))
+        devices = {}
+        for transition in transitions:
+            devices[transition.source.kinematics_index] = transition.source
+            devices[transition.destination.kinematics_index] = transition.destination
+        for index, energy in zip(indices, consumed_energy):
+            devices[int(index)].consume_energy(int(energy))
+
+    def clear(self) -> None:
+        self.pending_transitions.clear()
@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.simulation_models.memory.memory import Memory
+from src.environment.simulation_models.memory.packet_columns import PacketColumns
+
+
+@dataclass
+class ColumnarMemory(Memory):
+    """ memory backed by numpy columns, it stores and fetches by size in bulk instead of a packet at a time """
+    current_data: PacketColumns = field(default_factory=PacketColumns, init=False)
+
+    def fetch_data(self, data_size: int) -> List[DataPacket]:
+        if not self.has_data(data_size):
+            return self.pop_all_data()
+        self.current_size -= data_size
+        return self.current_data.fetch(data_size)
@@ -1,11 +1,21 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
 class DataPacket:
+    """
+    A batch of count identical packets, a batch is split only when a part of it is fetched and the split part reports
+    its arrival to the batch it was taken from.
+    """
     size: int
     life_time: int
     arrival_time: int = 0
+    count: int = 1
+    expiry_time: int = None
+    """ absolute time at which the packets expire, None if they never expire """
+    origin: 'DataPacket' = field(default=None, compare=False, repr=False)
+    num_of_arrived: int = field(default=0, compare=False, repr=False)
+    total_arrival_time: int = field(default=0, compare=False, repr=False)
 
     def __lt__(self, other):
         return self.life_time > other.life_time
@@ -13,11 +23,24 @@ class DataPacket:
     def __hash__(self):
         return hash(id(self))
 
-    def decrease_life_time(self) -> None:
-        self.life_time = max(0, self.life_time - 1)
+    def get_data_size(self) -> int:
+        return self.size * self.count
+
+    def get_count_for(self, data_size: int) -> int:
+        """ number of packets of the batch that covers data_size """
+        if self.size <= 0:
+            return self.count
+        return min(self.count, int(-(-data_size // self.size)))
+
+    def split(self, count: int) -> 'DataPacket':
+        self.count -= count
+        return DataPacket(size=self.size, life_time=self.life_time, arrival_time=self.arrival_time, count=count,
+                          expiry_time=self.expiry_time, origin=self)
 
     def set_arrival_time(self, time: int) -> None:
         self.arrival_time = time
-
-    def is_alive(self):
-        return self.life_time > 0
+        batch = self
+        while batch is not None:
+            batch.num_of_arrived += self.count
+            batch.total_arrival_time += time * self.count
+            batch = batch.origin
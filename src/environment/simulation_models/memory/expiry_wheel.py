@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.utils.priority_queue import PriorityQueue
+
+
+@dataclass
+class ExpiryWheel:
+    """
+    Packets bucketed by their absolute expiry time, only the buckets that are due are visited. A bucket may still hold
+    packets that already left the memory, the memory skips them when the bucket expires.
+    """
+    buckets: Dict[int, List[DataPacket]] = field(default_factory=dict)
+    deadlines: PriorityQueue = field(default_factory=PriorityQueue)
+
+    def add(self, data_packet: DataPacket) -> None:
+        if data_packet.expiry_time is None:
+            return
+        bucket = self.buckets.get(data_packet.expiry_time)
+        if bucket is None:
+            bucket = self.buckets[data_packet.expiry_time] = []
+            self.deadlines.push(data_packet.expiry_time)
+        bucket.append(data_packet)
+
+    def get_next_time(self) -> Optional[int]:
+        if self.deadlines.is_empty():
+            return None
+        return self.deadlines.get_item()
+
+    def pop_expired(self, current_time: int) -> List[DataPacket]:
+        expired = []
+        while not self.deadlines.is_empty() and self.deadlines.get_item() <= current_time:
+            expired.extend(self.buckets.pop(self.deadlines.pop()))
+        return expired
+
+    def move_all_to(self, other: 'ExpiryWheel') -> None:
+        if other.deadlines.is_empty():
+            self.buckets, other.buckets = other.buckets, self.buckets
+            self.deadlines, other.deadlines = other.deadlines, self.deadlines
+            return
+        for bucket in self.buckets.values():
+            for data_packet in bucket:
+                other.add(data_packet)
+        self.buckets.clear()
+        self.deadlines.clear()
+
+    def load(self, data_packets: List[DataPacket]) -> None:
+        self.buckets.clear()
+        self.deadlines.clear()
+        for data_packet in data_packets:
+            self.add(data_packet)
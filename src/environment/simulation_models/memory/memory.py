@@ -1,10 +1,11 @@
 from copy import copy
 from dataclasses import dataclass, field
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 from src.environment.core.globals import multiply_by_speed_rate
 from src.environment.simulation_models.memory.data_packet import DataPacket
-from src.environment.utils.priority_queue import PriorityQueue
+from src.environment.simulation_models.memory.expiry_wheel import ExpiryWheel
+from src.environment.simulation_models.memory.packet_queue import PacketQueue
 
 
 @dataclass
@@ -12,13 +13,25 @@ class Memory:
     size: int
     io_speed: int
     current_size: int = 0
-    current_data: PriorityQueue = field(default_factory=PriorityQueue, init=False)
+    current_data: PacketQueue = field(default_factory=PacketQueue, init=False)
+    expiry_wheel: ExpiryWheel = field(default_factory=ExpiryWheel, init=False, repr=False)
 
     def __post_init__(self):
         self.io_speed = multiply_by_speed_rate(self.io_speed)
 
+    def can_hand_over_to(self, other: 'Memory', data_size: int) -> bool:
+        """ whether moving data_size takes all of the data and other can take it as a whole """
+        return not self.has_data(data_size) and other.has_memory(self.get_data_size()) \
+            and type(self.current_data) is type(other.current_data) and self.current_data is not other.current_data
+
     def move_to(self, other: 'Memory', data_size: int) -> None:
-        other.store_data(self.fetch_data(data_size))
+        if not self.can_hand_over_to(other, data_size):
+            other.store_data(self.fetch_data(data_size))
+            return
+        other.current_size += self.get_data_size()
+        self.current_size = 0
+        self.current_data.move_all_to(other.current_data)
+        self.expiry_wheel.move_all_to(other.expiry_wheel)
 
     def get_available(self) -> int:
         return self.size - self.current_size
@@ -31,12 +44,13 @@ class Memory:
 
     def pop_prior_packet(self) -> DataPacket:
         data_packets = self.current_data.pop()
-        self.current_size -= data_packets.size
+        self.current_size -= data_packets.get_data_size()
         return data_packets
 
     def add_packet(self, data_packet: DataPacket) -> None:
-        self.current_size += data_packet.size
+        self.current_size += data_packet.get_data_size()
         self.current_data.push(data_packet)
+        self.expiry_wheel.add(data_packet)
 
     def pop_all_data(self) -> List[DataPacket]:
         self.current_size = 0
@@ -45,29 +59,56 @@ class Memory:
         return data
 
     def read_data(self) -> List[DataPacket]:
-        return list(copy(self.current_data))
+        return list(self.current_data)
+
+    def iter_data(self) -> Iterator[DataPacket]:
+        """ iterates over the stored packets without copying them, the packets must not be modified """
+        return iter(self.current_data)
+
+    def get_data_size(self) -> int:
+        return self.current_data.data_size
+
+    def get_num_of_packets(self) -> int:
+        return self.current_data.num_of_packets
 
     def fetch_data(self, data_size: int) -> List[DataPacket]:
         if not self.has_data(data_size):
             return self.pop_all_data()
-        current_data_size = 0
-        data = []
-        while len(self.current_data) > 0 and current_data_size < data_size:
-            packet_data = self.current_data.pop()
-            current_data_size += packet_data.size
-            data.append(packet_data)
+        data = self.current_data.pop_up_to(data_size, DataPacket.get_data_size)
+        current_data_size = sum(packet_data.get_data_size() for packet_data in data)
+        if len(self.current_data) > 0 and current_data_size < data_size:
+            packet_data = self.current_data[0]
+            count = packet_data.get_count_for(data_size - current_data_size)
+            data.append(self.current_data.take(count) if count < packet_data.count else self.current_data.pop())
         self.current_size -= data_size
         return data
 
     def store_data(self, data_packets: List[DataPacket], overwrite: bool = False) -> None:
-        data_size = sum(packet.size for packet in data_packets)
+        data_size = sum(packet.get_data_size() for packet in data_packets)
         if not self.has_memory(data_size):
             if not overwrite or data_size > self.size:
                 return
             self.fetch_data(data_size - self.get_available())
+        self.current_size += data_size
+        self.current_data.push_all(data_packets)
         for data_packet in data_packets:
-            self.add_packet(data_packet)
+            self.expiry_wheel.add(data_packet)
+
+    def get_snapshot(self) -> Tuple[int, List[DataPacket]]:
+        return self.current_size, [copy(packet) for packet in self.current_data]
+
+    def restore_snapshot(self, snapshot: Tuple[int, List[DataPacket]]) -> None:
+        self.current_size, data_packets = snapshot
+        data_packets = [copy(packet) for packet in data_packets]
+        self.current_data.load(data_packets)
+        self.expiry_wheel.load(data_packets)
+
+    def get_next_expiry_time(self) -> Optional[int]:
+        return self.expiry_wheel.get_next_time()
 
-    def remove_outdated_packets(self) -> None:
-        while len(self.current_data) > 0 and not self.current_data[0].is_alive():
-            self.pop_prior_packet()
+    def remove_expired_packets(self, current_time: int) -> None:
+        expired = self.expiry_wheel.pop_expired(current_time)
+        if len(expired) == 0:
+            return
+        for data_packet in self.current_data.remove_all(expired):
+            self.current_size -= data_packet.get_data_size()
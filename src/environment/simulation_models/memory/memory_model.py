@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List, Optional
 
+from src.data.instrumentation import measure
 from src.environment.simulation_models.memory.memory import Memory
 from src.environment.simulation_models.memory.data_packet import DataPacket
 
@@ -11,6 +12,9 @@ class MemoryModel:
     receiving_buffer: Memory
     memory: Memory
 
+    def get_memories(self) -> List[Memory]:
+        return [self.sending_buffer, self.receiving_buffer, self.memory]
+
     def has_data(self) -> bool:
         return self.memory.has_data()
 
@@ -40,13 +44,44 @@ class MemoryModel:
     def store_data_in_memory(self, data_packets: List[DataPacket], overwrite: bool = False) -> None:
         self.memory.store_data(data_packets, overwrite)
 
-    def step(self):
+    def remove_expired_packets(self, current_time: int) -> None:
+        for memory in self.get_memories():
+            memory.remove_expired_packets(current_time)
+
+    def get_next_expiry_time(self) -> Optional[int]:
+        expiry_times = [memory.get_next_expiry_time() for memory in self.get_memories()]
+        return min((time for time in expiry_times if time is not None), default=None)
+
+    @measure
+    def step(self, current_time: int = 0):
         self.move_to_memory()
-        self.memory.remove_outdated_packets()
+        self.remove_expired_packets(current_time)
 
     def read_data(self) -> List[DataPacket]:
         return self.memory.read_data()
 
+    def iter_data(self) -> Iterator[DataPacket]:
+        return self.memory.iter_data()
+
+    def get_data_size(self) -> int:
+        return self.memory.get_data_size()
+
+    def get_num_of_packets(self) -> int:
+        return self.memory.get_num_of_packets()
+
+    def get_stored_queues(self) -> List:
+        """ the packet queues of the buffers and the memory, a queue shared by two buffers is listed once """
+        queues = {}
+        for memory in self.get_memories():
+            queues.setdefault(id(memory.current_data), memory.current_data)
+        return list(queues.values())
+
+    def get_total_data_size(self) -> int:
+        return sum(queue.data_size for queue in self.get_stored_queues())
+
+    def get_total_num_of_packets(self) -> int:
+        return sum(queue.num_of_packets for queue in self.get_stored_queues())
+
     def get_available_to_send(self) -> int:
         return self.sending_buffer.current_size
 
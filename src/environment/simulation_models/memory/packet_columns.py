@@ -0,0 +1,149 @@
+from typing import List
+
+import numpy as np
+
+from src.environment.simulation_models.memory.data_packet import DataPacket
+
+
+class PacketColumns:
+    """
+    Packets kept in preallocated numpy columns sorted by descending life time, packets with the same life time keep
+    their insertion order. The stored packets are the rows between head and tail so popping from the front only moves
+    head. The stored bytes and packets are kept as running counters.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.life_times = np.zeros(capacity)
+        self.data_sizes = np.zeros(capacity)
+        self.packets = np.empty(capacity, dtype=object)
+        self.head = 0
+        self.tail = 0
+        self.data_size = 0
+        self.num_of_packets = 0
+
+    def __iter__(self):
+        return iter(self.packets[self.head:self.tail])
+
+    def __getitem__(self, index):
+        return self.packets[self.head + index]
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def reserve(self, num_of_rows: int) -> None:
+        """ makes room for num_of_rows rows after tail by moving the stored rows to the front or growing the columns """
+        if self.tail + num_of_rows <= len(self.packets):
+            return
+        length = len(self)
+        capacity = max(len(self.packets), 1)
+        while length + num_of_rows > capacity:
+            capacity *= 2
+        rows = slice(self.head, self.tail)
+        if capacity == len(self.packets):
+            self.life_times[:length] = self.life_times[rows]
+            self.data_sizes[:length] = self.data_sizes[rows]
+            self.packets[:length] = self.packets[rows]
+            self.packets[length:self.tail] = None
+        else:
+            life_times, data_sizes, packets = np.zeros(capacity), np.zeros(capacity), np.empty(capacity, dtype=object)
+            life_times[:length] = self.life_times[rows]
+            data_sizes[:length] = self.data_sizes[rows]
+            packets[:length] = self.packets[rows]
+            self.life_times, self.data_sizes, self.packets = life_times, data_sizes, packets
+        self.head, self.tail = 0, length
+
+    def push_all(self, packets: List[DataPacket]) -> None:
+        if len(packets) == 0:
+            return
+        life_times = np.array([packet.life_time for packet in packets], dtype=float)
+        data_sizes = np.array([packet.get_data_size() for packet in packets], dtype=float)
+        new_packets = np.empty(len(packets), dtype=object)
+        new_packets[:] = packets
+        order = np.argsort(-life_times, kind='stable')
+        self.reserve(len(packets))
+        start, end = self.tail, self.tail + len(packets)
+        self.life_times[start:end] = life_times[order]
+        self.data_sizes[start:end] = data_sizes[order]
+        self.packets[start:end] = new_packets[order]
+        if start > self.head and self.life_times[start - 1] < self.life_times[start]:
+            rows = slice(self.head, end)
+            order = np.argsort(-self.life_times[rows], kind='stable')
+            self.life_times[rows] = self.life_times[rows][order]
+            self.data_sizes[rows] = self.data_sizes[rows][order]
+            self.packets[rows] = self.packets[rows][order]
+        self.tail = end
+        self.data_size += sum(packet.get_data_size() for packet in packets)
+        self.num_of_packets += sum(packet.count for packet in packets)
+
+    def push(self, packet: DataPacket) -> None:
+        self.push_all([packet])
+
+    def pop(self) -> DataPacket:
+        if self.head == self.tail:
+            raise IndexError("Packet columns are empty.")
+        packet = self.packets[self.head]
+        self.packets[self.head] = None
+        self.head += 1
+        self.data_size -= packet.get_data_size()
+        self.num_of_packets -= packet.count
+        return packet
+
+    def fetch(self, data_size: int) -> List[DataPacket]:
+        """ pops the prior packets that cover data_size, the last batch is split when only a part of it is needed """
+        if data_size <= 0:
+            return []
+        cumulative_sizes = np.cumsum(self.data_sizes[self.head:self.tail])
+        cut = int(np.searchsorted(cumulative_sizes, data_size, side='left'))
+        data = list(self.packets[self.head:self.head + cut])
+        if cut < len(self):
+            packet = self.packets[self.head + cut]
+            count = packet.get_count_for(data_size - (cumulative_sizes[cut - 1] if cut > 0 else 0))
+            if 0 < count < packet.count:
+                data.append(packet.split(count))
+                self.data_sizes[self.head + cut] = packet.get_data_size()
+            elif count == packet.count:
+                data.append(packet)
+                cut += 1
+        self.packets[self.head:self.head + cut] = None
+        self.head += cut
+        self.data_size -= sum(packet.get_data_size() for packet in data)
+        self.num_of_packets -= sum(packet.count for packet in data)
+        return data
+
+    def remove_all(self, items: List[DataPacket]) -> List[DataPacket]:
+        """ removes the given packets by identity and returns the ones that were stored """
+        ids = {id(item) for item in items}
+        rows = slice(self.head, self.tail)
+        keep = np.fromiter((id(packet) not in ids for packet in self.packets[rows]), dtype=bool, count=len(self))
+        removed = list(self.packets[rows][~keep])
+        if len(removed) > 0:
+            end = self.head + int(keep.sum())
+            self.life_times[self.head:end] = self.life_times[rows][keep]
+            self.data_sizes[self.head:end] = self.data_sizes[rows][keep]
+            self.packets[self.head:end] = self.packets[rows][keep]
+            self.packets[end:self.tail] = None
+            self.tail = end
+            self.data_size -= sum(packet.get_data_size() for packet in removed)
+            self.num_of_packets -= sum(packet.count for packet in removed)
+        return removed
+
+    def move_all_to(self, other: 'PacketColumns') -> None:
+        """ moves every packet to other, into empty columns the columns themselves are handed over """
+        if len(other) > 0:
+            other.push_all(list(self))
+            self.clear()
+            return
+        for name in ('life_times', 'data_sizes', 'packets', 'head', 'tail', 'data_size', 'num_of_packets'):
+            own, others = getattr(self, name), getattr(other, name)
+            setattr(self, name, others)
+            setattr(other, name, own)
+
+    def clear(self) -> None:
+        self.packets[self.head:self.tail] = None
+        self.head = self.tail = 0
+        self.data_size = 0
+        self.num_of_packets = 0
+
+    def load(self, items: List[DataPacket]) -> None:
+        self.clear()
+        self.push_all(items)
@@ -0,0 +1,55 @@
+from typing import List
+
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.utils.priority_queue import PriorityQueue
+
+
+class PacketQueue(PriorityQueue):
+    """ priority queue of packet batches that keeps running counters of the stored bytes and packets """
+
+    def __init__(self):
+        super().__init__()
+        self.data_size = 0
+        self.num_of_packets = 0
+
+    def update_counters(self, items: List[DataPacket], sign: int = 1) -> None:
+        self.data_size += sign * sum(item.get_data_size() for item in items)
+        self.num_of_packets += sign * sum(item.count for item in items)
+
+    def push(self, item: DataPacket):
+        super().push(item)
+        self.update_counters([item])
+
+    def push_all(self, items: List[DataPacket]) -> None:
+        super().push_all(items)
+        self.update_counters(items)
+
+    def remove_at(self, index: int) -> DataPacket:
+        item = super().remove_at(index)
+        self.update_counters([item], sign=-1)
+        return item
+
+    def take(self, count: int) -> DataPacket:
+        """ splits count packets off the prior batch """
+        item = self.get_item().split(count)
+        self.update_counters([item], sign=-1)
+        return item
+
+    def move_all_to(self, other: 'PacketQueue') -> None:
+        if not other.is_empty():
+            super().move_all_to(other)
+            return
+        super().move_all_to(other)
+        other.data_size, other.num_of_packets = self.data_size, self.num_of_packets
+        self.data_size = self.num_of_packets = 0
+
+    def clear(self):
+        super().clear()
+        self.data_size = 0
+        self.num_of_packets = 0
+
+    def load(self, items: List[DataPacket]):
+        super().load(items)
+        self.data_size = 0
+        self.num_of_packets = 0
+        self.update_counters(items)
@@ -1,6 +1,9 @@
 from dataclasses import dataclass, field
 from typing import List, Tuple
 
+import numpy as np
+
+from src.data.instrumentation import measure
 from src.environment.core.globals import multiply_by_speed_rate
 from src.environment.devices.device import Device
 from src.environment.simulation_models.network.connection_protocol import ConnectionProtocol
@@ -27,11 +30,21 @@ class Connection:
             self.speed = new_speed
 
     def get_packets_after_error(self, data_packets: List[DataPacket]) -> Tuple[List[DataPacket], int]:
-        data_size = sum(data_packer.size for data_packer in data_packets)
+        data_size = sum(data_packer.get_data_size() for data_packer in data_packets)
         error = self.protocol.calculate_data_loss(data_size)
+        return self.remove_lost_packets(data_packets, error)
+
+    @staticmethod
+    def remove_lost_packets(data_packets: List[DataPacket], error: float) -> Tuple[List[DataPacket], int]:
+        """ drops error bytes from the end of data_packets, the last batch is trimmed when only a part of it is lost """
         while len(data_packets) > 0 and error > 0:
-            data_packet = data_packets.pop()
-            error -= data_packet.size
+            data_packet = data_packets[-1]
+            count = data_packet.get_count_for(error)
+            if count < data_packet.count:
+                data_packet.count -= count
+            else:
+                data_packets.pop()
+            error -= data_packet.size * count
         return data_packets, error
 
     def get_devices_roles(self, transfer_type: TransferType) -> Tuple[Device, Device]:
@@ -40,6 +53,7 @@ class Connection:
         else:
             return self.device2, self.device1
 
+    @measure
     def run(self, data_size: int, transfer_type: TransferType, time_step: int) -> DataTransition:
         sender, receiver = self.get_devices_roles(transfer_type)
         speed = multiply_by_speed_rate(self.speed)
@@ -58,3 +72,51 @@ class Connection:
         # TODO: implement IOT buffer management
         receiver.memory_model.move_to_memory()
         return DataTransition(sender, receiver, data_packets, self.protocol, error_loss)
+
+    @staticmethod
+    @measure
+    def run_flows(connections: List['Connection'], data_size: int, transfer_type: TransferType,
+                  time_step: int) -> List[DataTransition]:
+        """
+        flow level counterpart of run for connections into the same receiver. the volume every connection moves in this
+        tick is worked out for all of them at once from its speed, its remaining init data, what its sender holds and
+        what is left of data_size. senders sharing a memory model draw from the same data. every volume is clamped to
+        the space the receiver has left before its packets are fetched, the packets of each connection are stored on
+        their own. a fetch rounds up to whole packets, what it takes beyond the receiver space is dropped like lost
+        packets.
+        """
+        roles = [connection.get_devices_roles(transfer_type) for connection in connections]
+        receiver = roles[0][1]
+        speeds = np.array([multiply_by_speed_rate(connection.speed) for connection in connections])
+        init_data = np.maximum(np.array([connection.get_init_data() for connection in connections]), 0)
+        init_sent = np.minimum(speeds, init_data)
+        volumes = np.minimum(np.maximum(0, speeds - init_data), data_size)
+        group_of = {}
+        groups = np.array([group_of.setdefault(id(sender.memory_model), len(group_of)) for sender, _ in roles])
+        memory_models = {id(sender.memory_model): sender.memory_model for sender, _ in roles}
+        for group, memory_model in enumerate(memory_models.values()):
+            in_group = groups == group
+            requested = min(data_size, int(volumes[in_group].sum()))
+            if memory_model.get_available_to_send() < requested:
+                memory_model.move_to_buffer_queue(requested - memory_model.get_available_to_send())
+            group_volumes = volumes[in_group]
+            drawn = np.cumsum(group_volumes) - group_volumes
+            volumes[in_group] = np.clip(memory_model.get_available_to_send() - drawn, 0, group_volumes)
+        volumes = np.clip(data_size - (np.cumsum(volumes) - volumes), 0, volumes)
+        data_transitions = []
+        for connection, (sender, _), sent, volume in zip(connections, roles, init_sent, volumes):
+            connection.initialization_data_sent += int(sent)
+            volume = min(int(volume), receiver.memory_model.get_available_to_receive())
+            if volume <= 0:
+                continue
+            data_packets = sender.memory_model.fetch_data(volume)
+            error = connection.protocol.calculate_data_loss(sum(packet.get_data_size() for packet in data_packets))
+            data_packets, error_loss = connection.remove_lost_packets(data_packets, error)
+            overflow = sum(packet.get_data_size() for packet in data_packets) \
+                - receiver.memory_model.get_available_to_receive()
+            if overflow > 0:
+                data_packets, _ = connection.remove_lost_packets(data_packets, overflow)
+            receiver.store_data(data_packets, time_step=time_step)
+            data_transitions.append(DataTransition(sender, receiver, data_packets, connection.protocol, error_loss))
+        receiver.memory_model.move_to_memory()
+        return data_transitions
@@ -1,5 +1,7 @@
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from src.environment.core.random_streams import RandomStream
 
 
 @dataclass
@@ -13,9 +15,14 @@ class ConnectionProtocol:
     data_loss_percentage: float
     data_loss_probability: float
     initialization_data_size: int
+    random_stream: RandomStream = field(default=None, repr=False, compare=False)
+    """ the link loss stream of the environment, the global random module is used until one is bound """
 
     def calculate_data_loss(self, data_size: int) -> int:
-        rand = random.randint(1, 100) / 100
+        if self.random_stream is not None:
+            rand = self.random_stream.integers(1, 101) / 100
+        else:
+            rand = random.randint(1, 100) / 100
         data = 0
         if rand <= self.data_loss_probability / 100:
             data = (1 - self.data_loss_percentage / 100) * data_size
@@ -22,7 +22,7 @@ class DataTransition:
     size: int = field(init=False)
 
     def __post_init__(self):
-        self.size = sum(packet.size for packet in self.data)
+        self.size = sum(packet.get_data_size() for packet in self.data)
 
     def __str__(self):
         return f'{self.source} -> {self.destination}: size {self.size}'
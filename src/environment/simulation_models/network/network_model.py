@@ -1,6 +1,8 @@
+from copy import copy
 from dataclasses import field, dataclass
-from typing import List
+from typing import Dict, List, Tuple
 
+from src.data.instrumentation import measure
 from src.environment.simulation_models.network.connection_protocol import ConnectionProtocol
 from src.environment.simulation_models.network.data_transition import TransferType
 from src.environment.utils.vector import Vector
@@ -12,12 +14,22 @@ class NetworkModel:
     bandwidth: int
     coverage_radius: int
     protocol: ConnectionProtocol
-    connections: List = field(init=False, default_factory=list)
+    connections: Dict[Tuple[str, int], 'Connection'] = field(init=False, default_factory=dict)
+    """ connections keyed by the type name and the id of their second device """
 
+    @staticmethod
+    def get_key(device) -> Tuple[str, int]:
+        return type(device).__name__, device.id
+
+    @measure
     def update_connections_distances(self) -> None:
-        for connection in self.connections:
-            if self.center.distance_from(connection.device2.position) > self.coverage_radius:
-                self.disconnect(connection)
+        out_of_range = [key for key, connection in self.connections.items()
+                        if connection.device1.distance_from(connection.device2) > self.coverage_radius]
+        if len(out_of_range) == 0:
+            return
+        for key in out_of_range:
+            del self.connections[key]
+        self.update_connections_speed()
 
     def step(self) -> None:
         self.update_connections_distances()
@@ -32,18 +44,29 @@ class NetworkModel:
         if len(self.connections) == 0:
             return
         new_speed = self.bandwidth // len(self.connections)
-        for connection in self.connections:
+        for connection in self.connections.values():
             connection.update_speed(new_speed)
 
     def connect(self, source, destination, speed=0):
         from src.environment.simulation_models.network.connection import Connection
         connection = Connection(source, destination, self.protocol, speed)
-        self.connections.append(connection)
+        self.connections[self.get_key(destination)] = connection
         self.update_connections_speed()
         return connection
 
+    def connect_all(self, source, destinations: List, speed=0) -> List:
+        """ connects to all the destinations and shares the bandwidth once """
+        from src.environment.simulation_models.network.connection import Connection
+        connections = []
+        for destination in destinations:
+            connection = Connection(source, destination, self.protocol, speed)
+            self.connections[self.get_key(destination)] = connection
+            connections.append(connection)
+        self.update_connections_speed()
+        return connections
+
     def disconnect(self, connection):
-        self.connections.remove(connection)
+        del self.connections[self.get_key(connection.device2)]
         self.update_connections_speed()
 
     def transfer_data(self, source, destination, data_size: int, transfer_type: TransferType, time_step: int,
@@ -54,11 +77,24 @@ class NetworkModel:
             connection = self.connect(source, destination, speed)
         return connection.run(data_size, transfer_type, time_step)
 
+    def transfer_flows(self, source, destinations: List, data_size: int, transfer_type: TransferType, time_step: int,
+                       speed: int = 0) -> List:
+        from src.environment.simulation_models.network.connection import Connection
+        new_destinations = [destination for destination in destinations if not self.is_connected_to(destination)]
+        for destination in new_destinations:
+            assert source.in_range(destination), f'{destination} must be in range of the {source}'
+        self.connect_all(source, new_destinations, speed)
+        connections = [self.get_connection(destination) for destination in destinations]
+        return Connection.run_flows(connections, data_size, transfer_type, time_step)
+
+    def get_snapshot(self) -> Dict:
+        return {key: copy(connection) for key, connection in self.connections.items()}
+
+    def restore_snapshot(self, snapshot: Dict) -> None:
+        self.connections = {key: copy(connection) for key, connection in snapshot.items()}
+
     def delete_all_connections(self) -> None:
         self.connections.clear()
 
     def get_connection(self, device):
-        for connection in self.connections:
-            if connection.device2 == device:
-                return connection
-        return None
+        return self.connections.get(self.get_key(device))
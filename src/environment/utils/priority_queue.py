@@ -1,9 +1,16 @@
-from heapq import heappush, heappop
+from typing import Callable
 
 
 class PriorityQueue:
+    """
+    Binary min heap that keeps the position of every item, keyed by identity, so membership is O(1) and arbitrary
+    items can be removed or moved up after their priority decreased without rebuilding the heap. An object can be
+    stored only once at a time.
+    """
+
     def __init__(self):
         self.data = []
+        self.positions = {}
 
     def __iter__(self):
         return iter(self.data)
@@ -14,25 +21,133 @@ class PriorityQueue:
     def __len__(self):
         return len(self.data)
 
+    def __contains__(self, item) -> bool:
+        return id(item) in self.positions
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['positions']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """ copied or unpickled items are new objects, so their positions are keyed again """
+        self.__dict__.update(state)
+        self.positions = {id(item): index for index, item in enumerate(self.data)}
+
+    def set_item(self, index: int, item) -> None:
+        self.data[index] = item
+        self.positions[id(item)] = index
+
+    def sift_up(self, index: int) -> None:
+        item = self.data[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = self.data[parent_index]
+            if not item < parent:
+                break
+            self.set_item(index, parent)
+            index = parent_index
+        self.set_item(index, item)
+
+    def sift_down(self, index: int) -> None:
+        size = len(self.data)
+        item = self.data[index]
+        child_index = 2 * index + 1
+        while child_index < size:
+            right_index = child_index + 1
+            if right_index < size and self.data[right_index] < self.data[child_index]:
+                child_index = right_index
+            if not self.data[child_index] < item:
+                break
+            self.set_item(index, self.data[child_index])
+            index = child_index
+            child_index = 2 * index + 1
+        self.set_item(index, item)
+
+    def heapify(self) -> None:
+        self.positions = {id(item): index for index, item in enumerate(self.data)}
+        for index in reversed(range(len(self.data) // 2)):
+            self.sift_down(index)
+
+    def insert(self, item) -> None:
+        self.data.append(item)
+        self.positions[id(item)] = len(self.data) - 1
+        self.sift_up(len(self.data) - 1)
+
     def push(self, item):
-        heappush(self.data, item)
+        self.insert(item)
+
+    def push_all(self, items: list) -> None:
+        """ pushes a batch, a batch at least as large as the queue is merged and heapified in O(n + k) """
+        if len(items) < len(self.data):
+            for item in items:
+                self.insert(item)
+            return
+        self.data.extend(items)
+        self.heapify()
 
     def pop(self):
         if not self.data:
             raise IndexError("Priority queue is empty.")
-        return heappop(self.data)
+        return self.remove_at(0)
+
+    def pop_up_to(self, budget: float, get_size: Callable = lambda item: 1) -> list:
+        """ pops the prior items as long as their total size stays within budget """
+        items = []
+        total_size = 0
+        while self.data and total_size < budget and total_size + get_size(self.data[0]) <= budget:
+            item = self.remove_at(0)
+            total_size += get_size(item)
+            items.append(item)
+        return items
+
+    def remove_at(self, index: int):
+        item = self.data[index]
+        del self.positions[id(item)]
+        last = self.data.pop()
+        if index < len(self.data):
+            self.set_item(index, last)
+            self.sift_down(index)
+            self.sift_up(self.positions[id(last)])
+        return item
+
+    def remove(self, item) -> bool:
+        index = self.positions.get(id(item))
+        if index is None:
+            return False
+        self.remove_at(index)
+        return True
+
+    def remove_all(self, items: list) -> list:
+        """ removes the given items by identity and returns the ones that were in the queue """
+        return [item for item in items if self.remove(item)]
+
+    def decrease_key(self, item) -> None:
+        """ restores the heap after the priority of item decreased """
+        self.sift_up(self.positions[id(item)])
+
+    def move_all_to(self, other: 'PriorityQueue') -> None:
+        """ moves every item to other, into an empty queue the storage itself is handed over """
+        if other.is_empty():
+            other.data, self.data = self.data, other.data
+            other.positions, self.positions = self.positions, other.positions
+            return
+        other.push_all(self.data)
+        self.clear()
 
     def get_item(self):
         return self.data[0]
 
     def clear(self):
         self.data.clear()
+        self.positions.clear()
+
+    def load(self, items: list):
+        self.data = items
+        self.heapify()
 
     def has_item(self, item) -> bool:
-        for i in self.data:
-            if i == item:
-                return True
-        return False
+        return item in self
 
     def is_empty(self):
         return len(self.data) == 0
@@ -1,36 +1,75 @@
-from dataclasses import dataclass
-
 import numpy as np
 
 
-@dataclass
 class Vector:
-    x: float
-    y: float
-    z: float
+    """
+    A 3d vector backed by a numpy array of shape (3,). the array can be a row view into a KinematicsStore, in that
+    case writing to the vector writes directly to the store.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, x: float, y: float, z: float):
+        self.data = np.array([x, y, z], dtype=float)
+
+    @classmethod
+    def from_array(cls, data: np.ndarray) -> 'Vector':
+        vector = cls.__new__(cls)
+        vector.data = data
+        return vector
+
+    @property
+    def x(self) -> float:
+        return self.data[0]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self.data[0] = value
+
+    @property
+    def y(self) -> float:
+        return self.data[1]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.data[1] = value
+
+    @property
+    def z(self) -> float:
+        return self.data[2]
+
+    @z.setter
+    def z(self, value: float) -> None:
+        self.data[2] = value
 
     def __eq__(self, other):
         if type(self) != type(other):
             return False
-        return self.x == other.x and self.y == other.y and self.z == other.z
+        return self.data.tolist() == other.data.tolist()
 
     def __lt__(self, other):
         return self.x < other.x
 
+    def set(self, other: 'Vector') -> None:
+        self.data[:] = other.data
+
     def distance_from(self, other: 'Vector') -> float:
-        return np.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2)
+        diff = self.data - other.data
+        return float(np.sqrt(diff.dot(diff)))
 
     def __truediv__(self, other: 'Vector') -> 'Vector':
         pass
 
     def __add__(self, other: 'Vector') -> 'Vector':
-        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+        return Vector.from_array(self.data + other.data)
 
     def __sub__(self, other: 'Vector') -> 'Vector':
-        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+        return Vector.from_array(self.data - other.data)
 
     def __mul__(self, other: float) -> 'Vector':
-        return Vector(self.x * other, self.y * other, self.z * other)
+        return Vector.from_array(self.data * other)
+
+    def __repr__(self) -> str:
+        return f'Vector(x={self.x}, y={self.y}, z={self.z})'
 
     def __str__(self) -> str:
         return f'({self.x}, {self.y}, {self.z})'
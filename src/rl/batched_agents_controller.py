@@ -0,0 +1,95 @@
+from typing import List
+from dataclasses import dataclass, field
+
+from src.environment.core.vectorized_environment import VectorizedEnvironment
+from src.rl.data_collecting.data_collecting_agent import DataCollectingAgent
+from src.rl.data_forwarding.data_forwarding_agent import DataForwardingAgent
+from src.rl.rl_agents_controller import RLAgentController
+
+
+@dataclass
+class BatchedAgentController:
+    """
+    Runs the forwarding agents over a VectorizedEnvironment. the given agents own the networks and the learner step
+    count, every environment, the first one included, runs on clones sharing the networks so resetting an episode only
+    resets the clones. the states of all the clones of one agent are evaluated in a single predict call and the network
+    is trained once per step.
+    """
+    forwarding_agents: List[DataForwardingAgent]
+    collecting_agents: List[DataCollectingAgent]
+    environments: VectorizedEnvironment
+    episodes_rewards: List = field(init=False, default_factory=list)
+    forwarding_agents_batches: List[List[DataForwardingAgent]] = field(init=False, default_factory=list)
+    collecting_agents_batches: List[List[DataCollectingAgent]] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        for agent in self.forwarding_agents + self.collecting_agents:
+            agent.inject_environment_object(environment=self.environments[0])
+        for environment in self.environments.environments:
+            self.forwarding_agents_batches.append([agent.clone_for_environment(environment, uav)
+                                                   for agent, uav in zip(self.forwarding_agents, environment.uavs)])
+        self.collecting_agents_batches.append(self.collecting_agents)
+        for environment in self.environments.environments[1:]:
+            self.collecting_agents_batches.append([DataCollectingAgent(uav=uav, environment=environment)
+                                                   for uav in environment.uavs])
+
+    def start_episode(self, index: int) -> None:
+        self.environments.reset(index)
+        environment = self.environments[index]
+        for uav, forwarding_agent, collecting_agent in zip(environment.uavs, self.forwarding_agents_batches[index],
+                                                           self.collecting_agents_batches[index]):
+            forwarding_agent.initialize_for_episode(uav)
+            collecting_agent.initialize_for_episode(uav)
+
+    def end_episode(self, index: int, episode: int) -> None:
+        total_reward = 0
+        for lead_agent, agent in zip(self.forwarding_agents, self.forwarding_agents_batches[index]):
+            agent.update_samples(force_update=True)
+            lead_agent.train(episode)
+            total_reward += agent.episode_return
+            lead_agent.episodes_rewards.append(agent.episode_return)
+        self.episodes_rewards.append(total_reward)
+        RLAgentController.save_phase_timings(episode)
+
+    def step_forwarding_agents(self, episode: int) -> None:
+        running = [index for index in range(len(self.environments)) if not self.environments.has_ended(index)]
+        for agent_index, lead_agent in enumerate(self.forwarding_agents):
+            agents = [self.forwarding_agents_batches[index][agent_index] for index in running]
+            agents = [agent for agent in agents if not agent.is_busy()]
+            if len(agents) == 0:
+                continue
+            states = [agent.observe() for agent in agents]
+            actions = DataForwardingAgent.choose_epsilon_greedy_actions(
+                agents, states, lambda _, exploiting_states: lead_agent.get_q_values(exploiting_states))
+            for agent, state, action in zip(agents, states, actions):
+                agent.steps += 1
+                agent.act(state, action)
+            lead_agent.steps += len(agents)
+            lead_agent.train(episode)
+            for agent in agents:
+                agent.update_samples()
+                agent.update_epsilon()
+
+    def run_forwarding_agents(self, num_of_episodes: int) -> None:
+        for index in range(len(self.environments)):
+            self.start_episode(index)
+        episode = 0
+        while episode < num_of_episodes:
+            print(f'\r>Episode: {episode + 1} / {num_of_episodes}, Environments: {len(self.environments)} ', end='')
+            for index in range(len(self.environments)):
+                if self.environments.has_ended(index):
+                    continue
+                for agent in self.collecting_agents_batches[index]:
+                    agent.take_random_action()
+            self.step_forwarding_agents(episode)
+            self.environments.step()
+            for index in self.environments.get_ended():
+                self.end_episode(index, episode)
+                episode += 1
+                if episode >= num_of_episodes:
+                    break
+                self.start_episode(index)
+        agents_rewards = [agent.episodes_rewards for agent in self.forwarding_agents]
+        RLAgentController.save_reward_as_a_plot(rewards_list=agents_rewards, name='forward agents rewards')
+        RLAgentController.save_reward_as_a_plot(rewards_list=[self.episodes_rewards],
+                                                name='forward agents total reward')
@@ -1,10 +1,10 @@
-import random
 from dataclasses import dataclass, field
 from typing import List
 
 import numpy as np
 
 from src.environment.core.environment import Environment
+from src.environment.core.random_streams import RandomStream
 from src.environment.devices.uav import UAV
 
 
@@ -18,15 +18,22 @@ class DataCollectingAgent:
     log: List = field(init=False, default_factory=list)
     environment: Environment = None
     enable_logging: bool = False
+    random_stream: RandomStream = field(init=False, default=None, repr=False)
 
     def __post_init__(self):
         self.collection_rates = np.zeros(len(self.uav.way_points))
         self.last_gathering_times = np.zeros(len(self.uav.way_points))
+        if self.environment is not None:
+            self.bind_random_stream()
 
     def inject_environment_object(self, environment: Environment) -> None:
         if self.environment is not None:
             return
         self.environment = environment
+        self.bind_random_stream()
+
+    def bind_random_stream(self) -> None:
+        self.random_stream = self.environment.random_streams.get(f'collecting agent {self.uav.id}')
 
     def initialize_for_episode(self, uav: UAV):
         self.uav = uav
@@ -35,8 +42,8 @@ class DataCollectingAgent:
     def take_random_action(self):
         if self.collection_rates[self.uav.current_way_point] != 0:
             return
-        collection_rate = random.choice([30])
-        do_collect = random.choice([True, True])
+        collection_rate = self.random_stream.choice([30])
+        do_collect = self.random_stream.choice([True, True])
         self.collection_rates[self.uav.current_way_point] = collection_rate
         if do_collect:
             self.uav.assign_collection_rate(self.uav.current_way_point, collection_rate)
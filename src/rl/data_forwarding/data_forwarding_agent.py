@@ -1,15 +1,17 @@
 import logging
-import random
+from copy import copy
 
 import numpy as np
 import tensorflow as tf
 
-from typing import List, Any
+from typing import Any, Callable, List
 from dataclasses import dataclass, field
 
+from src.data.instrumentation import measure
 from src.environment.devices.device import Device
 from src.environment.devices.uav import UAV, UAVTask
 from src.environment.core.environment import Environment
+from src.environment.core.random_streams import RandomStream
 from src.environment.devices.base_station import BaseStation
 
 from src.rl.data_forwarding.data_forwarding_state import DataForwardingState
@@ -25,6 +27,8 @@ class DataForwardingAgent:
     samples: List[DataForwardingSample] = field(init=False, default_factory=list)
     model: Any = field(init=False)
     target_model: Any = field(init=False)
+    inference: Any = field(init=False, repr=False)
+    """ forward pass of the model traced once for batches of states, it skips the data pipeline of predict """
     memory: List = field(init=False, default_factory=list)
     epsilon: float
     epsilon_min: float
@@ -45,6 +49,7 @@ class DataForwardingAgent:
     log: List = field(init=False, default_factory=list)
     policy_samples: List = field(init=False, default_factory=list)
     enable_logging: bool = False
+    random_stream: RandomStream = field(init=False, default=None, repr=False)
 
     def __str__(self):
         return f'{self.uav}'
@@ -52,12 +57,19 @@ class DataForwardingAgent:
     def __post_init__(self):
         self.model = self.create_model()
         self.target_model = tf.keras.models.clone_model(self.model)
+        self.inference = self.create_inference()
         self.pass_action = self.action_size - 1
+        if self.environment is not None:
+            self.bind_random_stream()
 
     def inject_environment_object(self, environment: Environment) -> None:
         if self.environment is not None:
             return
         self.environment = environment
+        self.bind_random_stream()
+
+    def bind_random_stream(self) -> None:
+        self.random_stream = self.environment.random_streams.get(f'forwarding agent {self.uav.id}')
 
     def get_available_actions(self) -> List[int]:
         forward_targets = self.get_available_targets()
@@ -66,14 +78,26 @@ class DataForwardingAgent:
             return actions
         if type(forward_targets[0]) is BaseStation:
             for base_station in forward_targets:
-                actions.append(self.environment.base_stations.index(base_station))
+                actions.append(self.environment.get_index(base_station))
         else:
             for uav in forward_targets:
-                actions.append(self.environment.uavs.index(uav) + len(self.environment.base_stations))
+                actions.append(self.environment.get_index(uav) + len(self.environment.base_stations))
         return actions
 
+    def create_inference(self):
+        model = self.model
+
+        @tf.function(input_signature=[tf.TensorSpec(shape=(None, self.state_dim), dtype=tf.float32)])
+        def inference(states):
+            return model(states, training=False)
+
+        return inference
+
+    def get_q_values(self, states: List[List]) -> np.ndarray:
+        return self.inference(np.asarray(states, dtype=np.float32)).numpy()
+
     def choose_best_action(self, state):
-        q_values = self.model.predict(np.array([state.get()]), verbose=0)[0]
+        q_values = self.get_q_values([state.get()])[0]
         available_actions = self.get_available_actions()
         q_value = -1e18
         action = -1e18
@@ -84,19 +108,29 @@ class DataForwardingAgent:
         return action
 
     def choose_epsilon_greedy_action(self, state):
-        if np.random.rand() < self.epsilon:
-            actions = self.get_available_actions()
-            action = random.choice(actions)
-        else:
-            q_values = self.model.predict(np.array([state]), verbose=0)[0]
-            available_actions = self.get_available_actions()
-            q_value = -1e18
-            action = -1e18
-            for available_action in available_actions:
-                if q_values[available_action] > q_value:
-                    q_value = q_values[available_action]
-                    action = available_action
-        return action
+        return self.choose_epsilon_greedy_actions([self], [state], lambda _, states: self.get_q_values(states))[0]
+
+    @staticmethod
+    @measure
+    def choose_epsilon_greedy_actions(agents: List['DataForwardingAgent'], states: List[List],
+                                      get_q_values: Callable[[List, List], np.ndarray]) -> List[int]:
+        """
+        the agents that explore pick one of their available actions at random. the q values of the agents that exploit
+        are evaluated together, only when there is one, and their masked argmax is taken over the whole batch
+        """
+        exploring = [agent.random_stream.random() < agent.epsilon for agent in agents]
+        actions = [agent.random_stream.choice(agent.get_available_actions()) if explores else None
+                   for agent, explores in zip(agents, exploring)]
+        exploiting = [index for index, explores in enumerate(exploring) if not explores]
+        if len(exploiting) == 0:
+            return actions
+        q_values = get_q_values([agents[index] for index in exploiting], [states[index] for index in exploiting])
+        mask = np.zeros(q_values.shape, dtype=bool)
+        for row, index in enumerate(exploiting):
+            mask[row, agents[index].get_available_actions()] = True
+        for index, action in zip(exploiting, np.argmax(np.where(mask, q_values, -np.inf), axis=1)):
+            actions[index] = int(action)
+        return actions
 
     def take_forwarding_action(self, action):
         if action == self.pass_action:
@@ -157,6 +191,7 @@ class DataForwardingAgent:
         reward = self.beta * pdr
         return reward
 
+    @measure
     def update_samples(self, force_update: bool = False):
         if len(self.samples) > 1:
             self.samples[-2].update_next_state(self.samples[-1].state)
@@ -166,7 +201,7 @@ class DataForwardingAgent:
                 self.remember(sample)
                 continue
             arrived_packets = sample.get_num_of_arrived_packets()
-            if force_update or arrived_packets > 0.8 * len(sample.data_packets):
+            if force_update or arrived_packets > 0.8 * sample.num_of_packets:
                 reward = self.calculate_reward(sample)
                 self.episode_return += reward
                 sample.update_reward(reward)
@@ -205,18 +240,13 @@ class DataForwardingAgent:
             self.model.save_weights('{}/weights-{:08d}-{:08d}'.format(self.checkpoint_path, episode, self.steps))
 
     def calculate_reward(self, sample: DataForwardingSample) -> float:
-        arrived_packets = 0
-        end_to_end_delay = 0
+        arrived_packets = sample.get_num_of_arrived_packets()
+        end_to_end_delay = sample.get_total_delay()
         consumed_energy = 0
-        for data_packet in sample.data_packets:
-            if data_packet.arrival_time == 0:
-                continue
-            arrived_packets += 1
-            end_to_end_delay += data_packet.arrival_time - sample.created_time
-        if len(sample.data_packets) == 0:
+        if sample.num_of_packets == 0:
             pdr = 0
         else:
-            pdr = arrived_packets / len(sample.data_packets)
+            pdr = arrived_packets / sample.num_of_packets
             consumed_energy = self.uav.consumed_energy
         if arrived_packets == 0:
             end_to_end_delay = 0
@@ -228,9 +258,10 @@ class DataForwardingAgent:
         # TODO: add consumed energy penalty to the reward equation
         return pdr_reward - delay_penalty - consumed_energy_penalty
 
+    @measure
     def replay(self):
         if len(self.memory) > self.batch_size:
-            experience_sample = random.sample(self.memory, self.batch_size)
+            experience_sample = self.random_stream.sample(self.memory, self.batch_size)
             x = np.array([e[0] for e in experience_sample])
             y = self.model.predict(x, verbose=0)
             x2 = np.array([e[3] for e in experience_sample])
@@ -243,23 +274,51 @@ class DataForwardingAgent:
                     weight_name = weight.name.replace(':', '_')
                     tf.summary.histogram(weight_name, weight, step=self.steps)
 
-    def step(self, episode: int):
-        if self.is_busy():
-            return
-        self.steps += 1
+    def clone_for_environment(self, environment: Environment, uav: UAV) -> 'DataForwardingAgent':
+        """ returns an agent acting in another environment that shares the networks and the replay memory """
+        agent = copy(self)
+        agent.environment = environment
+        agent.uav = uav
+        agent.steps = 0
+        agent.episode_return = 0
+        agent.episodes_rewards = []
+        agent.samples = []
+        agent.log = []
+        agent.policy_samples = []
+        agent.bind_random_stream()
+        return agent
+
+    def observe(self) -> List:
         current_state = self.get_current_state(
             uavs_in_range=self.environment.get_in_range(self.uav, device_type=UAV),
             uavs=self.environment.uavs,
             neighbouring_base_stations=self.environment.get_in_range(self.uav, device_type=BaseStation),
             base_stations=self.environment.base_stations)
-        action = self.choose_epsilon_greedy_action(current_state.get())
+        return current_state.get()
+
+    def act(self, state: List, action: int) -> None:
         data_packets = self.take_forwarding_action(action)
-        sample = DataForwardingSample(created_time=self.environment.time_step, state=current_state.get(),
+        sample = DataForwardingSample(created_time=self.environment.time_step, state=state,
                                       action=action, data_packets=data_packets)
         self.add_sample(sample)
+
+    def train(self, episode: int) -> None:
         self.replay()
         self.update_target_network()
         self.save_weights(episode)
+
+    def step(self, episode: int, train: bool = True, state: List = None, action: int = None):
+        """ state and action can be given when they were already chosen for this step """
+        if self.is_busy():
+            return
+        self.steps += 1
+        if state is None:
+            state = self.observe()
+        if action is None:
+            action = self.choose_epsilon_greedy_action(state)
+        self.act(state, action)
+        if train:
+            self.train(episode)
         self.update_samples()
         self.update_epsilon()
 
@@ -285,7 +344,7 @@ class DataForwardingAgent:
                 sample.reward = 0
                 continue
             arrived_packets = sample.get_num_of_arrived_packets()
-            if force_update or arrived_packets > 0.8 * len(sample.data_packets):
+            if force_update or arrived_packets > 0.8 * sample.num_of_packets:
                 reward = self.calculate_reward(sample)
                 self.episode_return += reward
                 sample.update_reward(reward)
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Any
+from dataclasses import dataclass, field
+from typing import List, Any, Tuple
 
 from src.environment.simulation_models.memory.data_packet import DataPacket
 from src.rl.data_forwarding.data_forwarding_state import DataForwardingState
@@ -13,9 +13,16 @@ class DataForwardingSample:
     data_packets: List[DataPacket]
     next_state: Any = None
     reward: float = None
+    num_of_packets: int = field(init=False)
+    arrivals_at_creation: List[Tuple[int, int]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.num_of_packets = sum(data_packet.count for data_packet in self.data_packets)
+        self.arrivals_at_creation = [(data_packet.num_of_arrived, data_packet.total_arrival_time)
+                                     for data_packet in self.data_packets]
 
     def __str__(self):
-        return f'{self.created_time}: {self.state} + {self.action} + {len(self.data_packets)} ' \
+        return f'{self.created_time}: {self.state} + {self.action} + {self.num_of_packets} ' \
                f'-> {self.next_state} + {self.reward}'
 
     def has_completed(self) -> bool:
@@ -29,7 +36,13 @@ class DataForwardingSample:
 
     def get_num_of_arrived_packets(self) -> int:
         num = 0
-        for data_packet in self.data_packets:
-            if data_packet.arrival_time != 0:
-                num += 1
-        return num
+        for data_packet, (num_of_arrived, _) in zip(self.data_packets, self.arrivals_at_creation):
+            num += data_packet.num_of_arrived - num_of_arrived
+        return min(num, self.num_of_packets)
+
+    def get_total_delay(self) -> int:
+        """ sum of the end to end delays of the arrived packets """
+        total_arrival_time = 0
+        for data_packet, (_, arrival_time) in zip(self.data_packets, self.arrivals_at_creation):
+            total_arrival_time += data_packet.total_arrival_time - arrival_time
+        return total_arrival_time - self.get_num_of_arrived_packets() * self.created_time
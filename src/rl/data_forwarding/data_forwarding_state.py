@@ -25,16 +25,18 @@ class DataForwardingState:
         uav_positions = []
         base_stations = []
         uav_occupancies = []
+        neighbouring_uavs = set(self.neighbouring_uavs)
+        neighbouring_base_stations = set(self.neighbouring_base_stations)
         for uav in self.uavs:
             uav_occupancies.append(uav.get_occupancy_percentage())
             if uav is self.uav:
                 continue
-            if uav in self.neighbouring_uavs:
+            if uav in neighbouring_uavs:
                 uav_positions.append(uav.current_way_point)
             else:
                 uav_positions.append(-1)
         for base_station in self.base_stations:
-            if base_station in self.neighbouring_base_stations:
+            if base_station in neighbouring_base_stations:
                 base_stations.append(base_station.id)
             else:
                 base_stations.append(-1)
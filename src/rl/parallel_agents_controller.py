@@ -0,0 +1,155 @@
+import queue
+import traceback
+import multiprocessing
+from typing import List, Tuple
+from dataclasses import dataclass, field
+
+from src.data.instrumentation import instrumentation
+from src.rl.data_forwarding.data_forwarding_agent import DataForwardingAgent
+from src.rl.rl_agents_controller import RLAgentController
+
+
+def run_rollout_worker(worker_id: int, solution_id: int, event_driven: bool, max_steps: int, seed: int,
+                       transitions_queue, weights_queue, stop_event, flow_level: bool = False,
+                       sensing: bool = False, instrument: bool = False, failures_queue=None) -> None:
+    """
+    Runs episodes with inference copies of the forwarding agents and streams the collected transitions of every episode
+    to the learner, the weights and the epsilons of the copies are replaced whenever the learner broadcasts new ones.
+    all the randomness of the worker comes from its own spawn of the environment random streams. when the worker fails
+    its traceback is put on failures_queue so the learner can raise it.
+    """
+    try:
+        run_rollout_episodes(worker_id, solution_id, event_driven, max_steps, seed, transitions_queue, weights_queue,
+                             stop_event, flow_level, sensing, instrument)
+    except Exception:
+        if failures_queue is not None:
+            failures_queue.put((worker_id, traceback.format_exc()))
+        raise
+
+
+def run_rollout_episodes(worker_id: int, solution_id: int, event_driven: bool, max_steps: int, seed: int,
+                         transitions_queue, weights_queue, stop_event, flow_level: bool, sensing: bool,
+                         instrument: bool) -> None:
+    from src.data.file_manager import FileManager
+    from src.environment.core.controller import EnvironmentController
+    from src.environment.core.random_streams import RandomStreams
+    if instrument:
+        instrumentation.enable()
+    transitions_queue.cancel_join_thread()
+    env = FileManager(solution_id).load_environment(event_driven=event_driven, flow_level=flow_level,
+                                                    sensing=sensing)
+    env.set_random_streams(RandomStreams(seed=seed).spawn(worker_id))
+    forwarding_agents, collecting_agents = EnvironmentController.create_agents(env)
+    controller = RLAgentController(forwarding_agents=forwarding_agents, collecting_agents=collecting_agents,
+                                   environment=env, max_steps=max_steps,
+                                   phase_timings_name=f'phase timings worker {worker_id}')
+    episode = 0
+    while not stop_event.is_set():
+        policy = None
+        while True:
+            try:
+                policy = weights_queue.get_nowait()
+            except queue.Empty:
+                break
+        if policy is not None:
+            for agent, (agent_weights, epsilon) in zip(forwarding_agents, policy):
+                agent.model.set_weights(agent_weights)
+                agent.epsilon = epsilon
+        controller.run_episode(episode, num_of_episodes=0, train=False)
+        transitions = [agent.memory for agent in forwarding_agents]
+        returns = [agent.episode_return for agent in forwarding_agents]
+        decisions = [agent.steps for agent in forwarding_agents]
+        transitions_queue.put((transitions, returns, decisions))
+        for agent in forwarding_agents:
+            agent.memory = []
+        episode += 1
+
+
+@dataclass
+class ParallelAgentController:
+    """
+    Actor/learner training, each worker process owns an environment and inference copies of the forwarding agents, the
+    learner trains its agents on the streamed transitions and broadcasts their weights every weights_sync_interval
+    received episodes. the learner owns epsilon, it is decayed once for every decision the workers report and is
+    broadcast with the weights.
+    """
+    forwarding_agents: List[DataForwardingAgent]
+    solution_id: int
+    num_of_workers: int
+    max_steps: int
+    weights_sync_interval: int = 1
+    event_driven: bool = False
+    flow_level: bool = False
+    sensing: bool = False
+    seed: int = 0
+    instrument: bool = False
+    poll_interval: float = 1
+    """ seconds the learner waits for transitions before it checks whether a worker failed """
+    episodes_rewards: List = field(init=False, default_factory=list)
+
+    def get_policy(self) -> List[Tuple]:
+        return [(agent.model.get_weights(), agent.epsilon) for agent in self.forwarding_agents]
+
+    def learn(self, transitions: List[List], returns: List[float], decisions: List[int], episode: int) -> None:
+        for agent, agent_transitions, episode_return, num_of_decisions in zip(self.forwarding_agents, transitions,
+                                                                              returns, decisions):
+            agent.memory.extend(agent_transitions)
+            for _ in agent_transitions:
+                agent.steps += 1
+                agent.train(episode)
+            agent.epsilon = max(agent.epsilon_min, agent.epsilon * agent.epsilon_decay ** num_of_decisions)
+            agent.episodes_rewards.append(episode_return)
+        self.episodes_rewards.append(sum(returns))
+        RLAgentController.save_phase_timings(episode, name='phase timings learner')
+
+    def get_rollout(self, transitions_queue, failures_queue, workers: List) -> Tuple:
+        """ waits for the transitions of the next episode, raises the failure of a worker instead of waiting forever """
+        while True:
+            try:
+                return transitions_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                pass
+            if not failures_queue.empty():
+                worker_id, error = failures_queue.get()
+                raise RuntimeError(f'rollout worker {worker_id} failed:\n{error}')
+            for worker_id, worker in enumerate(workers):
+                if not worker.is_alive():
+                    raise RuntimeError(f'rollout worker {worker_id} exited with code {worker.exitcode}')
+
+    def run_forwarding_agents(self, num_of_episodes: int) -> None:
+        context = multiprocessing.get_context('spawn')
+        transitions_queue = context.Queue()
+        failures_queue = context.SimpleQueue()
+        weights_queues = [context.Queue() for _ in range(self.num_of_workers)]
+        stop_event = context.Event()
+        workers = []
+        for worker_id in range(self.num_of_workers):
+            worker = context.Process(target=run_rollout_worker, daemon=True,
+                                     args=(worker_id, self.solution_id, self.event_driven, self.max_steps,
+                                           self.seed, transitions_queue, weights_queues[worker_id],
+                                           stop_event, self.flow_level, self.sensing, self.instrument,
+                                           failures_queue))
+            worker.start()
+            workers.append(worker)
+        try:
+            policy = self.get_policy()
+            for weights_queue in weights_queues:
+                weights_queue.put(policy)
+            for episode in range(num_of_episodes):
+                print(f'\r>Episode: {episode + 1} / {num_of_episodes}, Workers: {self.num_of_workers} ', end='')
+                transitions, returns, decisions = self.get_rollout(transitions_queue, failures_queue, workers)
+                self.learn(transitions, returns, decisions, episode)
+                if (episode + 1) % self.weights_sync_interval == 0:
+                    policy = self.get_policy()
+                    for weights_queue in weights_queues:
+                        weights_queue.put(policy)
+        finally:
+            stop_event.set()
+            for worker in workers:
+                worker.join(timeout=10)
+                if worker.is_alive():
+                    worker.terminate()
+        agents_rewards = [agent.episodes_rewards for agent in self.forwarding_agents]
+        RLAgentController.save_reward_as_a_plot(rewards_list=agents_rewards, name='forward agents rewards')
+        RLAgentController.save_reward_as_a_plot(rewards_list=[self.episodes_rewards],
+                                                name='forward agents total reward')
@@ -1,13 +1,15 @@
-from typing import List
+from typing import Any, Dict, List
 from dataclasses import dataclass, field
 
 import numpy as np
+import tensorflow as tf
 from matplotlib import pyplot as plt
 
 from src.rl.data_collecting.data_collecting_agent import DataCollectingAgent
 from src.rl.data_forwarding.data_forwarding_agent import DataForwardingAgent
 
 from src.environment.core.environment import Environment
+from src.data.instrumentation import instrumentation
 
 
 @dataclass
@@ -19,6 +21,13 @@ class RLAgentController:
     steps: int = field(init=False, default=0)
     episodes_rewards: List = field(init=False, default_factory=list)
     enable_logging: bool = False
+    networks: Dict[int, int] = field(init=False, default_factory=dict)
+    """ index of the network of every forwarding agent among the distinct networks, keyed by the network id """
+    inference_model: Any = field(init=False, default=None)
+    """ evaluates all the distinct networks in one call, it reuses their layers so it follows their training """
+    inference: Any = field(init=False, default=None)
+    phase_timings_name: str = 'phase timings'
+    """ name of the csv file the phase timings of every episode are dumped to when instrumentation is enabled """
 
     def __post_init__(self):
         for a1, a2 in zip(self.forwarding_agents, self.collecting_agents):
@@ -27,33 +36,87 @@ class RLAgentController:
             a2.inject_environment_object(environment=self.environment)
             a2.enable_logging = self.enable_logging
 
+    def run_episode(self, episode: int, num_of_episodes: int, train: bool = True) -> float:
+        self.environment.reset()
+        for uav, forwarding_agent, collecting_agent in zip(self.environment.uavs, self.forwarding_agents,
+                                                           self.collecting_agents):
+            forwarding_agent.initialize_for_episode(uav)
+            collecting_agent.initialize_for_episode(uav)
+            if self.enable_logging:
+                forwarding_agent.log.append(f'episode: {episode + 1} >>>>>>>>>>>>>>>>>> ')
+        steps = 0
+        total_reward = 0
+        while not self.environment.has_ended() and steps <= self.max_steps:
+            if train:
+                print(f'\r>Episode: {episode + 1} / {num_of_episodes}, Step: {steps} / {self.max_steps} ', end='')
+            steps += 1
+            for agent in self.collecting_agents:
+                agent.take_random_action()
+            self.step_forwarding_agents(episode, train=train)
+            self.environment.step()
+        for agent in self.forwarding_agents:
+            agent.update_samples(force_update=True)
+            if train:
+                agent.train(episode)
+            total_reward += agent.episode_return
+            agent.episodes_rewards.append(agent.episode_return)
+        self.episodes_rewards.append(total_reward)
+        self.save_phase_timings(episode, name=self.phase_timings_name)
+        return total_reward
+
+    def build_inference_model(self) -> None:
+        models = {}
+        for agent in self.forwarding_agents:
+            models.setdefault(id(agent.model), agent.model)
+        self.networks = {network_id: index for index, network_id in enumerate(models)}
+        inputs = [tf.keras.Input(shape=model.input_shape[1:]) for model in models.values()]
+        outputs = [model(network_input) for model, network_input in zip(models.values(), inputs)]
+        self.inference_model = tf.keras.Model(inputs=inputs, outputs=outputs)
+        signature = [tf.TensorSpec(shape=(None, *model.input_shape[1:]), dtype=tf.float32) for model in models.values()]
+        self.inference = tf.function(lambda *states: self.inference_model(list(states), training=False),
+                                     input_signature=signature)
+
+    def predict_q_values(self, agents: List[DataForwardingAgent], states: List[List]) -> np.ndarray:
+        """ the states of the agents sharing a network form one batch, the batches of all the networks are evaluated
+        in a single call and the q values are stacked in the order of the agents """
+        if self.inference_model is None:
+            self.build_inference_model()
+        rows = [[] for _ in self.networks]
+        positions = []
+        for agent, state in zip(agents, states):
+            network_rows = rows[self.networks[id(agent.model)]]
+            positions.append((self.networks[id(agent.model)], len(network_rows)))
+            network_rows.append(state)
+        batch_size = max(len(network_rows) for network_rows in rows)
+        inputs = []
+        for network_rows, model_input in zip(rows, self.inference_model.inputs):
+            batch = np.zeros((batch_size, *model_input.shape[1:]), dtype=np.float32)
+            if len(network_rows) > 0:
+                batch[:len(network_rows)] = network_rows
+            inputs.append(batch)
+        outputs = self.inference(*inputs)
+        if len(rows) == 1:
+            outputs = [outputs]
+        outputs = [output.numpy() for output in outputs]
+        return np.array([outputs[network][row] for network, row in positions])
+
+    def step_forwarding_agents(self, episode: int, train: bool = True) -> None:
+        """
+        the agents that need a decision are observed together and choose their actions as one batch, the q values of
+        the ones that exploit come from one inference call. an agent whose uav was chosen as a forward target earlier
+        in the step is busy receiving and does not act.
+        """
+        agents = [agent for agent in self.forwarding_agents if not agent.is_busy()]
+        if len(agents) == 0:
+            return
+        states = [agent.observe() for agent in agents]
+        actions = DataForwardingAgent.choose_epsilon_greedy_actions(agents, states, self.predict_q_values)
+        for agent, state, action in zip(agents, states, actions):
+            agent.step(episode, train=train, state=state, action=action)
+
     def run_forwarding_agents(self, num_of_episodes):
         for episode in range(num_of_episodes):
-            self.environment.reset()
-            for uav, forwarding_agent, collecting_agent in zip(self.environment.uavs, self.forwarding_agents,
-                                                               self.collecting_agents):
-                forwarding_agent.initialize_for_episode(uav)
-                collecting_agent.initialize_for_episode(uav)
-                if self.enable_logging:
-                    forwarding_agent.log.append(f'episode: {episode + 1} >>>>>>>>>>>>>>>>>> ')
-            steps = 0
-            total_reward = 0
-            while not self.environment.has_ended() and steps <= self.max_steps:
-                print(f'\r>Episode: {episode + 1} / {num_of_episodes}, Step: {steps} / {self.max_steps} ', end='')
-                steps += 1
-                for agent in self.collecting_agents:
-                    agent.take_random_action()
-                for agent in self.forwarding_agents:
-                    agent.step(episode)
-                self.environment.step()
-            for agent in self.forwarding_agents:
-                agent.update_samples(force_update=True)
-                agent.replay()
-                agent.update_target_network()
-                agent.save_weights(episode)
-                total_reward += agent.episode_return
-                agent.episodes_rewards.append(agent.episode_return)
-            self.episodes_rewards.append(total_reward)
+            self.run_episode(episode, num_of_episodes)
         agents_rewards = [agent.episodes_rewards for agent in self.forwarding_agents]
         self.save_reward_as_a_plot(rewards_list=agents_rewards, name='forward agents rewards')
         self.save_reward_as_a_plot(rewards_list=[self.episodes_rewards], name='forward agents total reward')
@@ -79,6 +142,13 @@ class RLAgentController:
         agents_rewards = [agent.episodes_rewards for agent in self.forwarding_agents]
         print(agents_rewards)
 
+    @staticmethod
+    def save_phase_timings(episode: int, name: str = 'phase timings') -> None:
+        if not instrumentation.enabled:
+            return
+        instrumentation.dump(f'data/output/{name}.csv', episode)
+        instrumentation.reset()
+
     @staticmethod
     def save_reward_as_a_plot(rewards_list: List[List], chunk_size=1, name: str = 'none'):
         for rewards in rewards_list:
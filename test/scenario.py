@@ -0,0 +1,54 @@
+from src.data.file_manager import FileManager
+from src.environment.core.environment import Environment
+from src.environment.core.globals import update_speed_rate
+from src.environment.devices.base_station import BaseStation
+from src.environment.devices.sensor import Sensor
+from src.environment.devices.uav import UAV, UAVTask
+
+SAMPLE_DIR = 'data/input/test_sample_8/'
+
+
+def load_environment(input_dir: str = SAMPLE_DIR, **kwargs) -> Environment:
+    # the devices are loaded with the speed rate of the previous environment, a new process loads them with 1
+    update_speed_rate(1)
+    return FileManager(solution_id=0, input_dir=input_dir).load_environment(**kwargs)
+
+
+def act(environment: Environment, visited: set) -> None:
+    """ collects once at every way point with sensors in range and forwards to the first target in range """
+    for uav in environment.uavs:
+        if uav.steps_to_move == 0 and (uav.id, uav.current_way_point) not in visited \
+                and len(environment.get_in_range(uav, Sensor)) > 0:
+            visited.add((uav.id, uav.current_way_point))
+            uav.assign_collection_rate(uav.current_way_point, 30)
+            uav.assign_collect_data_task(uav.current_way_point)
+        if uav.is_active(UAVTask.FORWARD) or uav.is_active(UAVTask.RECEIVE) or uav.is_active(UAVTask.COLLECT) \
+                or uav.steps_to_move > 0 or not uav.memory_model.has_data():
+            continue
+        targets = environment.get_in_range(uav, BaseStation) or environment.get_in_range(uav, UAV)
+        if len(targets) == 0:
+            continue
+        if type(targets[0]) is UAV:
+            targets[0].assign_receiving_data_task()
+        uav.assign_forward_data_task(forward_data_target=targets[0],
+                                     data_to_forward=uav.memory_model.memory.current_size)
+
+
+def get_state(environment: Environment) -> tuple:
+    return (environment.time_step, [uav.position.data.tolist() for uav in environment.uavs],
+            [uav.consumed_energy for uav in environment.uavs],
+            [uav.num_of_collected_packets for uav in environment.uavs],
+            [uav.get_current_data_size() for uav in environment.uavs],
+            [sensor.get_current_data_size() for sensor in environment.sensors],
+            [base_station.get_current_data_size() for base_station in environment.base_stations])
+
+
+def run_episode(environment: Environment, max_steps: int = 20000, visited: set = None) -> tuple:
+    """ runs the policy until the episode ends and returns the final state and the number of steps """
+    visited = set() if visited is None else visited
+    steps = 0
+    while not environment.has_ended() and steps < max_steps:
+        act(environment, visited)
+        environment.step()
+        steps += 1
+    return get_state(environment), steps
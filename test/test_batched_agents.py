@@ -0,0 +1,34 @@
+import unittest
+
+from src.environment.core.controller import EnvironmentController
+from src.environment.core.vectorized_environment import VectorizedEnvironment
+from src.rl.batched_agents_controller import BatchedAgentController
+from test.scenario import load_environment
+
+
+class BatchedAgentControllerTest(unittest.TestCase):
+    def test_resetting_an_environment_keeps_the_learner_steps(self):
+        environment = load_environment()
+        environments = VectorizedEnvironment.replicate(environment, 3, max_steps=15)
+        forwarding_agents, collecting_agents = EnvironmentController.create_agents(environment)
+        controller = BatchedAgentController(forwarding_agents=forwarding_agents, collecting_agents=collecting_agents,
+                                            environments=environments)
+        for batch in controller.forwarding_agents_batches:
+            self.assertTrue(all(agent is not lead_agent for agent, lead_agent in zip(batch, forwarding_agents)))
+        for index in range(len(environments)):
+            controller.start_episode(index)
+        decisions = [0] * len(forwarding_agents)
+        while not any(environments.has_ended(index) for index in range(len(environments))):
+            controller.step_forwarding_agents(episode=0)
+            environments.step()
+            for agent_index in range(len(forwarding_agents)):
+                decisions[agent_index] = sum(batch[agent_index].steps for batch in controller.forwarding_agents_batches)
+        self.assertEqual([agent.steps for agent in forwarding_agents], decisions)
+        self.assertGreater(sum(decisions), 0)
+        controller.start_episode(0)
+        self.assertEqual([agent.steps for agent in forwarding_agents], decisions)
+        self.assertEqual([agent.steps for agent in controller.forwarding_agents_batches[0]], [0] * len(decisions))
+
+
+if __name__ == '__main__':
+    unittest.main()
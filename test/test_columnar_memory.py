@@ -0,0 +1,90 @@
+import random
+import unittest
+from copy import copy
+from typing import List
+
+from src.environment.simulation_models.memory.columnar_memory import ColumnarMemory
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.simulation_models.memory.memory import Memory
+from src.environment.simulation_models.memory.packet_columns import PacketColumns
+from test.scenario import load_environment, run_episode
+
+
+def get_packets(data_packets: List[DataPacket]) -> list:
+    """ the packets one by one, ordered so that the same packets compare equal however they were batched """
+    return sorted((packet.life_time, packet.size, packet.expiry_time) for packet in data_packets
+                  for _ in range(packet.count))
+
+
+class ColumnarMemoryTest(unittest.TestCase):
+    def assert_same_data(self, memory: Memory, columnar: ColumnarMemory) -> None:
+        self.assertEqual(columnar.current_size, memory.current_size)
+        self.assertEqual(columnar.get_data_size(), memory.get_data_size())
+        self.assertEqual(columnar.get_num_of_packets(), memory.get_num_of_packets())
+        self.assertEqual(get_packets(columnar.read_data()), get_packets(memory.read_data()))
+        self.assertEqual(columnar.get_next_expiry_time(), memory.get_next_expiry_time())
+
+    def test_store_fetch_and_expiry_match_memory(self):
+        generator = random.Random(0)
+        for _ in range(50):
+            size = generator.choice([50, 500, 5000])
+            memory, columnar = Memory(size=size, io_speed=10), ColumnarMemory(size=size, io_speed=10)
+            packet_size = generator.choice([1, 4, 7])
+            for time in range(100):
+                operation = generator.random()
+                if operation < 0.5:
+                    # batches of equal life time may be fetched in any order, the life times are kept distinct
+                    life_times = generator.sample(range(1000), generator.randint(0, 3))
+                    data_packets = [DataPacket(size=packet_size, life_time=life_time, count=generator.randint(1, 30),
+                                               expiry_time=time + life_time % 20) for life_time in life_times]
+                    overwrite = generator.random() < 0.5
+                    memory.store_data([copy(packet) for packet in data_packets], overwrite)
+                    columnar.store_data([copy(packet) for packet in data_packets], overwrite)
+                elif operation < 0.9:
+                    data_size = generator.randint(0, 200)
+                    self.assertEqual(get_packets(columnar.fetch_data(data_size)),
+                                     get_packets(memory.fetch_data(data_size)))
+                else:
+                    memory.remove_expired_packets(time)
+                    columnar.remove_expired_packets(time)
+                self.assert_same_data(memory, columnar)
+
+    def test_move_to_hands_over_between_backends(self):
+        memory, columnar = Memory(size=100, io_speed=10), ColumnarMemory(size=100, io_speed=10)
+        target, columnar_target = Memory(size=100, io_speed=10), ColumnarMemory(size=100, io_speed=10)
+        data_packets = [DataPacket(size=4, life_time=life_time, count=3, expiry_time=life_time) for life_time in (9, 3)]
+        memory.store_data([copy(packet) for packet in data_packets])
+        columnar.store_data([copy(packet) for packet in data_packets])
+        memory.move_to(target, 100)
+        columnar.move_to(columnar_target, 100)
+        self.assert_same_data(memory, columnar)
+        self.assert_same_data(target, columnar_target)
+        target.remove_expired_packets(3)
+        columnar_target.remove_expired_packets(3)
+        self.assert_same_data(target, columnar_target)
+        self.assertEqual(columnar_target.get_data_size(), 12)
+
+    def test_fetch_splits_the_batch_like_memory(self):
+        packets = PacketColumns()
+        packets.push_all([DataPacket(size=4, life_time=10, count=5), DataPacket(size=4, life_time=20, count=5)])
+        fetched = packets.fetch(10)
+        self.assertEqual(get_packets(fetched), [(20, 4, None)] * 3)
+        self.assertEqual(packets.data_size, 28)
+        self.assertEqual(packets.num_of_packets, 7)
+
+    def test_fetching_nothing_returns_no_batches(self):
+        memory, columnar = Memory(size=100, io_speed=10), ColumnarMemory(size=100, io_speed=10)
+        for target in (memory, columnar):
+            target.store_data([DataPacket(size=4, life_time=10, count=5)])
+        self.assertEqual(columnar.fetch_data(0), memory.fetch_data(0))
+        self.assertEqual(columnar.fetch_data(0), [])
+        self.assertEqual(columnar.get_num_of_packets(), 5)
+        self.assertEqual(len(columnar.current_data), 1)
+        self.assert_same_data(memory, columnar)
+
+    def test_columnar_sample_runs_like_the_default_one(self):
+        self.assertEqual(run_episode(load_environment('data/input/test_sample_11/')), run_episode(load_environment()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.simulation_models.memory.memory import Memory
+from src.environment.simulation_models.memory.memory_model import MemoryModel
+from src.environment.simulation_models.network.connection import Connection
+from src.environment.simulation_models.network.connection_protocol import ConnectionProtocol
+from src.environment.simulation_models.network.data_transition import TransferType
+from test.scenario import load_environment
+
+
+def get_memory_model(size: int, io_speed: int) -> MemoryModel:
+    return MemoryModel(sending_buffer=Memory(size, io_speed), receiving_buffer=Memory(size, io_speed),
+                       memory=Memory(size, io_speed))
+
+
+class RunFlowsTest(unittest.TestCase):
+    def test_nearly_full_receiver_keeps_every_transition(self):
+        environment = load_environment()
+        protocol = ConnectionProtocol(data_loss_percentage=0, data_loss_probability=0, initialization_data_size=0)
+        receiver = environment.base_stations[0]
+        receiver.memory_model = get_memory_model(size=100, io_speed=0)
+        receiver.memory_model.receiving_buffer.store_data([DataPacket(size=1, life_time=50, count=75)])
+        connections = []
+        for sender in environment.uavs:
+            sender.memory_model = get_memory_model(size=1000, io_speed=1000)
+            sender.memory_model.store_data_in_memory([DataPacket(size=7, life_time=50, count=20)])
+            connections.append(Connection(device1=sender, device2=receiver, protocol=protocol, speed=10))
+        data_transitions = Connection.run_flows(connections, data_size=1000, transfer_type=TransferType.SEND,
+                                                time_step=0)
+        received = receiver.memory_model.receiving_buffer
+        self.assertGreater(len(data_transitions), 1)
+        self.assertLessEqual(received.current_size, received.size)
+        self.assertEqual(received.get_data_size(), 75 + sum(transition.size for transition in data_transitions))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from src.environment.simulation_models.energy.energy_model import EnergyModel
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.simulation_models.network.data_transition import DataTransition
+from test.scenario import load_environment
+
+
+def get_data_transition_energy(energy_model: EnergyModel, data_transition: DataTransition) -> int:
+    """ energy of one transition computed the way it was before the accounting was vectorized """
+    k = data_transition.size
+    distance = data_transition.source.position.distance_from(data_transition.destination.position)
+    if distance < energy_model.distance_threshold:
+        e_t = k * (energy_model.e_elec + energy_model.power_amplifier_for_fs * (distance ** 2))
+    else:
+        e_t = k * (energy_model.e_elec + energy_model.power_amplifier_for_amp * (distance ** 4))
+    e_r = k * energy_model.e_elec
+    return int((e_t + e_r) / 1e4)
+
+
+class EnergyModelTest(unittest.TestCase):
+    def test_flush_matches_per_transition_accounting(self):
+        environment = load_environment()
+        energy_model = EnergyModel(e_elec=50, distance_threshold=8000, power_amplifier_for_fs=1e-2,
+                                   power_amplifier_for_amp=1.3e-9)
+        generator = random.Random(0)
+        devices = environment.get_devices()
+        expected = {id(device): 0 for device in devices}
+        for _ in range(200):
+            source, destination = generator.sample(devices, 2)
+            data = [DataPacket(life_time=10, size=4, count=generator.randrange(1, 50))]
+            transition = DataTransition(source=source, destination=destination, data=data,
+                                        protocol=source.network_model.protocol, data_loss=0)
+            energy = get_data_transition_energy(energy_model, transition)
+            expected[id(source)] += energy
+            expected[id(destination)] += energy
+            energy_model.record(transition)
+        consumed = {id(device): device.consumed_energy for device in devices}
+        energy_model.flush(environment.kinematics)
+        self.assertEqual(energy_model.pending_transitions, [])
+        self.assertEqual({id(device): device.consumed_energy - consumed[id(device)] for device in devices}, expected)
+        self.assertGreater(sum(expected.values()), 0)
+
+    def test_flush_without_transitions_changes_nothing(self):
+        environment = load_environment()
+        consumed = [device.consumed_energy for device in environment.get_devices()]
+        environment.uavs[0].energy_model.flush(environment.kinematics)
+        self.assertEqual([device.consumed_energy for device in environment.get_devices()], consumed)
+
+
+if __name__ == '__main__':
+    unittest.main()
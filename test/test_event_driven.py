@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from test.scenario import SAMPLE_DIR, load_environment, run_episode
+
+UAV_COLUMNS = ['x', 'y', 'z', 'x velocity', 'y velocity', 'z velocity', 'x acceleration', 'y acceleration',
+               'z acceleration', 'energy', 'speed']
+
+
+def run(input_dir: str, event_driven: bool) -> tuple:
+    return run_episode(load_environment(input_dir, event_driven=event_driven))
+
+
+class EventDrivenTest(unittest.TestCase):
+    def assert_same_as_ticks(self, input_dir: str) -> None:
+        ticks, num_of_ticks = run(input_dir, event_driven=False)
+        events, num_of_events = run(input_dir, event_driven=True)
+        self.assertEqual(ticks, events)
+        self.assertLess(num_of_events, num_of_ticks)
+
+    def test_sample_matches_tick_mode(self):
+        self.assert_same_as_ticks(SAMPLE_DIR)
+
+    def test_packet_expiry_matches_tick_mode(self):
+        with tempfile.TemporaryDirectory() as input_dir:
+            shutil.copytree(SAMPLE_DIR, input_dir, dirs_exist_ok=True)
+            sensors = pd.read_csv(os.path.join(input_dir, 'sensors.csv'))
+            sensors['packet life time'] = 1000
+            sensors['packet expiry'] = 1
+            sensors.to_csv(os.path.join(input_dir, 'sensors.csv'), index=False)
+            self.assert_same_as_ticks(input_dir)
+
+    def test_uav_passing_an_idle_uav_matches_tick_mode(self):
+        """ the idle uav holds data and the other uav only comes into its range in the middle of a leg """
+        with tempfile.TemporaryDirectory() as input_dir:
+            shutil.copytree(SAMPLE_DIR, input_dir, dirs_exist_ok=True)
+            pd.DataFrame([[10406, 17271, 0, 0, 0, 0, 0, 0, 0, 100, 15], [1000, 20000, 0, 0, 0, 0, 0, 0, 0, 100, 15]],
+                         columns=UAV_COLUMNS).to_csv(os.path.join(input_dir, 'uavs.csv'), index=False)
+            pd.DataFrame([[1, 10406, 17271, 0, 0], [2, 1000, 20000, 0, 0], [2, 48000, 20000, 0, 0]],
+                         columns=['uav id', 'x', 'y', 'z', 'collection rate']) \
+                .to_csv(os.path.join(input_dir, 'way_points.csv'), index=False)
+            ticks, _ = run(input_dir, event_driven=False)
+            self.assertEqual(ticks[4][0], 0, 'the idle uav hands its data over to the passing uav')
+            self.assert_same_as_ticks(input_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
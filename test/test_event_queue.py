@@ -0,0 +1,28 @@
+import unittest
+
+from src.environment.core.event_queue import EventQueue, EventType
+
+
+class EventQueueTest(unittest.TestCase):
+    def test_pop_until_returns_due_events_in_time_then_schedule_order(self):
+        events = EventQueue()
+        events.schedule(30, EventType.PACKET_EXPIRY, 'c')
+        events.schedule(10, EventType.WAY_POINT_ARRIVAL, 'a')
+        events.schedule(10, EventType.PACKET_EXPIRY, 'b')
+        events.schedule(40, EventType.WAY_POINT_ARRIVAL, 'd')
+        self.assertEqual(events.get_next_time(), 10)
+        self.assertEqual([event.device for event in events.pop_until(30)], ['a', 'b', 'c'])
+        self.assertEqual(events.get_next_time(), 40)
+        self.assertEqual(events.pop_until(39), [])
+        self.assertEqual(len(events), 1)
+
+    def test_clear_empties_the_queue(self):
+        events = EventQueue()
+        events.schedule(5, EventType.WAY_POINT_ARRIVAL)
+        events.clear()
+        self.assertIsNone(events.get_next_time())
+        self.assertEqual(len(events), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.environment.simulation_models.memory.expiry_wheel import ExpiryWheel
+
+
+def get_expiry_times(data_packets) -> list:
+    return sorted(packet.expiry_time for packet in data_packets)
+
+
+class ExpiryWheelTest(unittest.TestCase):
+    def test_deadline_equal_to_the_current_time_expires(self):
+        wheel = ExpiryWheel()
+        packet = DataPacket(size=1, life_time=5, expiry_time=5)
+        wheel.add(packet)
+        self.assertEqual(wheel.pop_expired(4), [])
+        self.assertEqual(wheel.get_next_time(), 5)
+        self.assertEqual(wheel.pop_expired(5), [packet])
+        self.assertIsNone(wheel.get_next_time())
+
+    def test_only_due_buckets_are_popped(self):
+        wheel = ExpiryWheel()
+        for expiry_time in (9, 10, 10, 11):
+            wheel.add(DataPacket(size=1, life_time=10, expiry_time=expiry_time))
+        wheel.add(DataPacket(size=1, life_time=10))
+        self.assertEqual(get_expiry_times(wheel.pop_expired(10)), [9, 10, 10])
+        self.assertEqual(list(wheel.buckets), [11])
+        self.assertEqual(wheel.get_next_time(), 11)
+        wheel.add(DataPacket(size=1, life_time=10, expiry_time=10))
+        self.assertEqual(get_expiry_times(wheel.pop_expired(10)), [10])
+        self.assertEqual(get_expiry_times(wheel.pop_expired(100)), [11])
+
+    def test_matches_a_scan_of_the_live_packets(self):
+        generator = random.Random(0)
+        wheel, stored = ExpiryWheel(), []
+        for time in range(200):
+            for _ in range(generator.randint(0, 3)):
+                expiry_time = None if generator.random() < 0.2 else time + generator.randint(0, 15)
+                packet = DataPacket(size=1, life_time=10, expiry_time=expiry_time)
+                wheel.add(packet)
+                stored.append(packet)
+            expired = [packet for packet in stored if packet.expiry_time is not None and packet.expiry_time <= time]
+            stored = [packet for packet in stored if packet.expiry_time is None or packet.expiry_time > time]
+            self.assertEqual(get_expiry_times(wheel.pop_expired(time)), get_expiry_times(expired))
+            self.assertEqual(wheel.get_next_time(), min((packet.expiry_time for packet in stored
+                                                         if packet.expiry_time is not None), default=None))
+
+    def test_move_all_to_merges_buckets(self):
+        wheel, other = ExpiryWheel(), ExpiryWheel()
+        for expiry_time in (3, 6):
+            wheel.add(DataPacket(size=1, life_time=10, expiry_time=expiry_time))
+        other.add(DataPacket(size=1, life_time=10, expiry_time=6))
+        wheel.move_all_to(other)
+        self.assertIsNone(wheel.get_next_time())
+        self.assertEqual(get_expiry_times(other.pop_expired(6)), [3, 6, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from copy import deepcopy
+
+import numpy as np
+
+from src.environment.core.controller import EnvironmentController
+from src.environment.simulation_models.memory.data_packet import DataPacket
+from src.rl.data_forwarding.data_forwarding_agent import DataForwardingAgent
+from src.rl.rl_agents_controller import RLAgentController
+from test.scenario import load_environment
+
+
+class ForwardingAgentsTest(unittest.TestCase):
+    def setUp(self):
+        environment = load_environment()
+        for uav in environment.uavs:
+            uav.memory_model.store_data_in_memory([DataPacket(size=4, life_time=100, count=10)])
+        self.forwarding_agents, collecting_agents = EnvironmentController.create_agents(environment)
+        self.controller = RLAgentController(forwarding_agents=self.forwarding_agents,
+                                            collecting_agents=collecting_agents, environment=environment, max_steps=10)
+        self.states = [agent.observe() for agent in self.forwarding_agents]
+
+    def test_batched_choice_matches_choosing_one_agent_at_a_time(self):
+        q_values = np.random.default_rng(0).normal(size=(len(self.forwarding_agents),
+                                                         self.forwarding_agents[0].action_size))
+        for epsilon in (0, 0.5, 1):
+            for agent in self.forwarding_agents:
+                agent.epsilon = epsilon
+            streams = [deepcopy(agent.random_stream) for agent in self.forwarding_agents]
+            expected = []
+            for agent, stream, agent_q_values in zip(self.forwarding_agents, streams, q_values):
+                available_actions = agent.get_available_actions()
+                if stream.random() < agent.epsilon:
+                    expected.append(stream.choice(available_actions))
+                else:
+                    expected.append(max(available_actions, key=lambda action: agent_q_values[action]))
+            exploiting_rows = []
+
+            def get_q_values(agents, _):
+                rows = [self.forwarding_agents.index(agent) for agent in agents]
+                exploiting_rows.append(rows)
+                return q_values[rows]
+
+            actions = DataForwardingAgent.choose_epsilon_greedy_actions(self.forwarding_agents, self.states,
+                                                                        get_q_values)
+            self.assertEqual(actions, expected)
+            self.assertLessEqual(len(exploiting_rows), 1)
+            if epsilon == 1:
+                self.assertEqual(exploiting_rows, [])
+
+    def test_predicted_q_values_match_each_agent(self):
+        q_values = self.controller.predict_q_values(self.forwarding_agents, self.states)
+        expected = np.array([agent.get_q_values([state])[0] for agent, state in zip(self.forwarding_agents,
+                                                                                     self.states)])
+        np.testing.assert_allclose(q_values, expected, rtol=1e-5, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from src.environment.devices.base_station import BaseStation
+from src.environment.devices.sensor import Sensor
+from src.environment.devices.uav import UAV
+from test.scenario import load_environment
+
+
+class KinematicsStoreTest(unittest.TestCase):
+    def test_device_vectors_are_views_of_the_store(self):
+        environment = load_environment()
+        uav = environment.uavs[1]
+        uav.position.data += 5
+        np.testing.assert_array_equal(environment.kinematics.positions[uav.kinematics_index], uav.position.data)
+        self.assertIs(uav.network_model.center, uav.position)
+
+    def test_move_applies_velocity_and_acceleration(self):
+        environment = load_environment()
+        uav = environment.uavs[0]
+        uav.velocity.data[:] = [3, 4, 0]
+        uav.acceleration.data[:] = [1, 0, 0]
+        position = uav.position.data.copy()
+        environment.move_uavs([uav])
+        np.testing.assert_array_equal(uav.velocity.data, [4, 4, 0])
+        np.testing.assert_array_equal(uav.position.data, position + [4, 4, 0])
+
+    def test_in_range_follows_moved_uavs(self):
+        environment = load_environment()
+        random = np.random.default_rng(0)
+        for _ in range(20):
+            for uav in environment.uavs:
+                uav.velocity.data[:] = [*random.uniform(-3000, 3000, 2), 0]
+            environment.move_uavs(environment.uavs)
+            for uav in environment.uavs:
+                for device_type, devices in ((Sensor, environment.sensors), (UAV, environment.uavs),
+                                             (BaseStation, environment.base_stations)):
+                    expected = [device for device in devices if device is not uav and
+                                uav.position.distance_from(device.position) <= uav.network_model.coverage_radius]
+                    self.assertEqual(environment.get_in_range(uav, device_type), expected)
+
+
+class DistanceCacheTest(unittest.TestCase):
+    def assert_distances_are_current(self, environment) -> None:
+        positions = environment.kinematics.positions
+        for index, row in environment.kinematics.distance_rows.items():
+            np.testing.assert_allclose(row, np.linalg.norm(positions - positions[index], axis=1))
+
+    def test_only_uav_rows_are_cached(self):
+        environment = load_environment()
+        store = environment.kinematics
+        sensor, uav = environment.sensors[0], environment.uavs[0]
+        self.assertAlmostEqual(sensor.distance_from(uav), uav.position.distance_from(sensor.position))
+        self.assertAlmostEqual(sensor.distance_from(environment.sensors[1]),
+                               sensor.position.distance_from(environment.sensors[1].position))
+        sources = np.arange(len(store))
+        store.get_distances(sources, sources[::-1])
+        self.assertEqual(set(store.distance_rows), {uav.kinematics_index})
+
+    def test_cached_rows_follow_moves_and_legs(self):
+        environment = load_environment()
+        for uav in environment.uavs:
+            environment.get_in_range(uav, Sensor)
+        uav = environment.uavs[0]
+        uav.velocity.data[:] = [2000, 1000, 0]
+        environment.move_uavs([uav])
+        self.assert_distances_are_current(environment)
+        environment.kinematics.start_leg(uav.kinematics_index, environment.time_step, 10)
+        environment.time_step += 4
+        environment.advance_uavs()
+        self.assert_distances_are_current(environment)
+        pairs = np.arange(len(environment.kinematics))
+        np.testing.assert_allclose(environment.kinematics.get_distances(pairs, pairs[::-1]),
+                                   np.linalg.norm(environment.kinematics.positions -
+                                                  environment.kinematics.positions[::-1], axis=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
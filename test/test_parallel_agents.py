@@ -0,0 +1,73 @@
+import queue
+import random
+import threading
+import unittest
+
+import numpy as np
+
+from src.environment.core.controller import EnvironmentController
+from src.environment.core.globals import update_speed_rate
+from src.rl.parallel_agents_controller import ParallelAgentController, run_rollout_worker
+from test.scenario import load_environment
+
+
+class StoppingQueue(queue.Queue):
+    """ keeps what the worker puts and stops it after its first episode """
+    def __init__(self, stop_event: threading.Event):
+        super().__init__()
+        self.stop_event = stop_event
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        self.stop_event.set()
+
+    def cancel_join_thread(self) -> None:
+        pass
+
+
+def run_one_episode(policy, seed: int = 0):
+    stop_event = threading.Event()
+    transitions_queue, weights_queue = StoppingQueue(stop_event), queue.Queue()
+    weights_queue.put(policy)
+    update_speed_rate(1)
+    run_rollout_worker(worker_id=1, solution_id=8, event_driven=False, max_steps=30, seed=seed,
+                       transitions_queue=transitions_queue, weights_queue=weights_queue, stop_event=stop_event)
+    return transitions_queue.get_nowait()
+
+
+class ParallelAgentControllerTest(unittest.TestCase):
+    def setUp(self):
+        forwarding_agents, _ = EnvironmentController.create_agents(load_environment())
+        self.controller = ParallelAgentController(forwarding_agents=forwarding_agents, solution_id=8, num_of_workers=1,
+                                                  max_steps=30)
+
+    def test_learner_decays_epsilon_by_the_reported_decisions(self):
+        agents = self.controller.forwarding_agents
+        self.controller.learn([[] for _ in agents], [0] * len(agents), list(range(len(agents))), episode=0)
+        for num_of_decisions, agent, (_, epsilon) in zip(range(len(agents)), agents, self.controller.get_policy()):
+            self.assertAlmostEqual(agent.epsilon, agent.epsilon_decay ** num_of_decisions)
+            self.assertEqual(epsilon, agent.epsilon)
+
+    def test_worker_draws_from_its_own_streams(self):
+        policy = self.controller.get_policy()
+        episodes = []
+        for global_seed in (1, 2):
+            # the global generators only seed the initial weights, which are replaced by the broadcast ones
+            random.seed(global_seed)
+            np.random.seed(global_seed)
+            episodes.append(run_one_episode(policy))
+        first, second = episodes
+        self.assertEqual(first[1:], second[1:])
+        self.assertEqual([len(transitions) for transitions in first[0]],
+                         [len(transitions) for transitions in second[0]])
+        self.assertGreater(sum(first[2]), 0)
+
+    def test_learner_raises_the_failure_of_a_worker(self):
+        controller = ParallelAgentController(forwarding_agents=self.controller.forwarding_agents, solution_id=-1,
+                                             num_of_workers=1, max_steps=30, poll_interval=0.1)
+        with self.assertRaisesRegex(RuntimeError, 'rollout worker 0 failed'):
+            controller.run_forwarding_agents(num_of_episodes=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import copy
+import pickle
+import random
+import unittest
+
+from src.environment.utils.priority_queue import PriorityQueue
+
+
+class Item:
+    def __init__(self, priority: int, size: int = 1):
+        self.priority = priority
+        self.size = size
+
+    def __lt__(self, other: 'Item') -> bool:
+        return self.priority < other.priority
+
+
+def get_priorities(items) -> list:
+    return [item.priority for item in items]
+
+
+class PriorityQueueTest(unittest.TestCase):
+    def assert_valid(self, queue: PriorityQueue) -> None:
+        for index, item in enumerate(queue.data):
+            self.assertEqual(queue.positions[id(item)], index)
+            if index > 0:
+                self.assertFalse(item < queue.data[(index - 1) >> 1])
+        self.assertEqual(len(queue.positions), len(queue.data))
+
+    def pop_all(self, queue: PriorityQueue) -> list:
+        return get_priorities(queue.pop() for _ in range(len(queue)))
+
+    def test_push_all_small_and_large_batches(self):
+        generator = random.Random(0)
+        queue = PriorityQueue()
+        priorities = []
+        for size in (1, 5, 2, 40, 3):
+            batch = [Item(generator.randrange(100)) for _ in range(size)]
+            priorities += get_priorities(batch)
+            queue.push_all(batch)
+            self.assert_valid(queue)
+        self.assertEqual(self.pop_all(queue), sorted(priorities))
+
+    def test_pop_up_to_stays_within_budget(self):
+        queue = PriorityQueue()
+        queue.push_all([Item(priority, size) for priority, size in enumerate([3, 4, 2, 5])])
+        popped = queue.pop_up_to(8, get_size=lambda item: item.size)
+        self.assertEqual(get_priorities(popped), [0, 1])
+        self.assertEqual(get_priorities(queue.pop_up_to(1, get_size=lambda item: item.size)), [])
+        self.assertEqual(get_priorities(queue.pop_up_to(100, get_size=lambda item: item.size)), [2, 3])
+        self.assert_valid(queue)
+
+    def test_remove_at_keeps_the_heap(self):
+        generator = random.Random(1)
+        items = [Item(generator.randrange(50)) for _ in range(60)]
+        queue = PriorityQueue()
+        queue.push_all(items)
+        removed = set()
+        for _ in range(30):
+            item = queue.remove_at(generator.randrange(len(queue)))
+            removed.add(id(item))
+            self.assertNotIn(item, queue)
+            self.assert_valid(queue)
+        self.assertEqual(self.pop_all(queue), sorted(get_priorities(item for item in items
+                                                                    if id(item) not in removed)))
+
+    def test_remove_all_returns_only_stored_items(self):
+        items = [Item(priority) for priority in range(5)]
+        queue = PriorityQueue()
+        queue.push_all(items[:3])
+        self.assertEqual(queue.remove_all([items[1], items[4]]), [items[1]])
+        self.assertEqual(self.pop_all(queue), [0, 2])
+
+    def test_decrease_key_moves_the_item_up(self):
+        items = [Item(priority) for priority in range(10, 20)]
+        queue = PriorityQueue()
+        queue.push_all(items)
+        items[7].priority = 1
+        queue.decrease_key(items[7])
+        self.assert_valid(queue)
+        self.assertIs(queue.get_item(), items[7])
+
+    def test_move_all_to_empty_and_non_empty_queues(self):
+        source, target = PriorityQueue(), PriorityQueue()
+        source.push_all([Item(priority) for priority in (4, 1, 3)])
+        source.move_all_to(target)
+        self.assertTrue(source.is_empty())
+        source.push_all([Item(priority) for priority in (2, 0)])
+        source.move_all_to(target)
+        self.assert_valid(target)
+        self.assertEqual(self.pop_all(target), [0, 1, 2, 3, 4])
+
+    def test_copies_index_their_own_items(self):
+        queue = PriorityQueue()
+        queue.push_all([Item(priority) for priority in (5, 2, 8, 1)])
+        for copied in (copy.deepcopy(queue), pickle.loads(pickle.dumps(queue))):
+            self.assert_valid(copied)
+            item = copied.data[2]
+            self.assertIn(item, copied)
+            self.assertTrue(copied.remove(item))
+            self.assert_valid(copied)
+        self.assertEqual(self.pop_all(queue), [1, 2, 5, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from src.data.file_manager import FileManager
+from src.environment.core.controller import EnvironmentController
+from src.environment.core.random_streams import RandomStreams
+from src.environment.core.vectorized_environment import VectorizedEnvironment
+
+
+class RandomStreamsTest(unittest.TestCase):
+    def test_same_seed_and_name_give_the_same_values(self):
+        first = RandomStreams(seed=3).get('link loss')
+        second = RandomStreams(seed=3).get('link loss')
+        self.assertEqual([first.random() for _ in range(5000)], [second.random() for _ in range(5000)])
+
+    def test_stream_does_not_depend_on_other_streams(self):
+        streams = RandomStreams(seed=3)
+        other = streams.get('collecting agent 0')
+        for _ in range(100):
+            other.random()
+        fresh = RandomStreams(seed=3).get('link loss')
+        self.assertEqual([streams.get('link loss').random() for _ in range(10)], [fresh.random() for _ in range(10)])
+
+    def test_spawned_streams_differ_from_parent_and_siblings(self):
+        streams = RandomStreams(seed=3)
+        values = [[stream.get('link loss').random() for _ in range(10)]
+                  for stream in (streams, streams.spawn(1), streams.spawn(2))]
+        self.assertNotEqual(values[0], values[1])
+        self.assertNotEqual(values[1], values[2])
+
+    def test_integers_and_sample_stay_in_bounds(self):
+        stream = RandomStreams(seed=0).get('test')
+        self.assertTrue(all(2 <= stream.integers(2, 5) < 5 for _ in range(1000)))
+        sample = stream.sample(list(range(10)), 4)
+        self.assertEqual(len(set(sample)), 4)
+
+
+class AgentStreamsTest(unittest.TestCase):
+    def test_cloned_agents_draw_from_their_environment_streams(self):
+        environment = FileManager(8).load_environment()
+        environments = VectorizedEnvironment.replicate(environment, 3, max_steps=10)
+        forwarding_agents, _ = EnvironmentController.create_agents(environment)
+        agent = forwarding_agents[0]
+        agent.inject_environment_object(environment)
+        clones = [agent.clone_for_environment(copy, copy.uavs[0]) for copy in environments.environments[1:]]
+        self.assertIs(agent.random_stream, environment.random_streams.get(f'forwarding agent {agent.uav.id}'))
+        for clone, copy in zip(clones, environments.environments[1:]):
+            self.assertIs(clone.random_stream, copy.random_streams.get(f'forwarding agent {clone.uav.id}'))
+        self.assertIsNot(clones[0].random_stream, clones[1].random_stream)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.data.scenario_generator import ScenarioGenerator
+
+
+class ScenarioGeneratorTest(unittest.TestCase):
+    def test_sweep_tour_covers_the_strip_cells(self):
+        generator = ScenarioGenerator(num_of_sensors=10, num_of_uavs=2, land_size=16000, coverage_radius=2000)
+        tour = generator.generate_sweep_tour(0)
+        self.assertEqual(tour.tolist(), [[2000, 2000], [2000, 6000], [2000, 10000], [2000, 14000],
+                                         [6000, 14000], [6000, 10000], [6000, 6000], [6000, 2000]])
+
+    def test_land_smaller_than_a_cell_gets_one_way_point_per_uav(self):
+        for land_size in (1000, 2000):
+            generator = ScenarioGenerator(num_of_sensors=5, num_of_uavs=2, land_size=land_size, coverage_radius=2000)
+            self.assertEqual([generator.generate_sweep_tour(uav_index).tolist() for uav_index in range(2)],
+                             [[[land_size // 4, land_size // 2]], [[3 * land_size // 4, land_size // 2]]])
+            with tempfile.TemporaryDirectory() as output_dir:
+                generator.write(output_dir)
+                way_points = pd.read_csv(os.path.join(output_dir, 'way_points.csv'))
+                self.assertEqual(way_points['uav id'].tolist(), [1, 2])
+
+    def test_invalid_sizes_are_rejected(self):
+        for kwargs in ({'land_size': -1}, {'num_of_uavs': 0}, {'coverage_radius': 0}):
+            with self.assertRaises(AssertionError):
+                ScenarioGenerator(**{'num_of_sensors': 5, 'num_of_uavs': 1, **kwargs})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from copy import deepcopy
+
+from src.environment.core.event_queue import EventType
+from src.environment.core.random_streams import RandomStreams
+from test.scenario import act, load_environment, run_episode
+
+
+def get_events(environment) -> list:
+    return sorted((event.time, event.event_type, id(event.device)) for event in environment.events.events)
+
+
+class SnapshotTest(unittest.TestCase):
+    def assert_reset_matches_copy(self, **kwargs) -> None:
+        environment = load_environment(**kwargs)
+        pristine = environment.copy()
+        first = run_episode(environment)
+        environment.reset()
+        # the random streams are not part of the state, they are restarted so the episode draws the same link losses
+        environment.set_random_streams(RandomStreams(seed=environment.seed))
+        second = run_episode(environment)
+        self.assertEqual(first, second)
+        self.assertEqual(run_episode(pristine), second)
+
+    def test_reset_matches_a_deep_copy_of_the_initial_environment(self):
+        self.assert_reset_matches_copy()
+
+    def test_reset_matches_in_event_driven_mode(self):
+        self.assert_reset_matches_copy(event_driven=True)
+
+    def test_reset_matches_with_lazy_sensing(self):
+        self.assert_reset_matches_copy(sensing=True)
+
+    def test_restore_mid_leg_schedules_the_pending_arrivals(self):
+        environment = load_environment(event_driven=True)
+        visited = set()
+        while not any(uav.steps_to_move > 0 for uav in environment.uavs):
+            act(environment, visited)
+            environment.step()
+        events = get_events(environment)
+        self.assertIn(EventType.WAY_POINT_ARRIVAL, [event_type for _, event_type, _ in events])
+        snapshot, snapshot_visited = environment.get_snapshot(), set(visited)
+        streams = deepcopy(environment.random_streams)
+        first = run_episode(environment, visited=visited)
+        environment.restore_snapshot(snapshot)
+        self.assertEqual(get_events(environment), events)
+        environment.set_random_streams(streams)
+        self.assertEqual(run_episode(environment, visited=snapshot_visited), first)
+
+    def test_reset_restores_devices_in_place(self):
+        environment = load_environment()
+        uavs, memories = list(environment.uavs), environment.get_memories()
+        run_episode(environment, max_steps=50)
+        environment.reset()
+        self.assertEqual([id(uav) for uav in environment.uavs], [id(uav) for uav in uavs])
+        self.assertEqual([id(memory) for memory in environment.get_memories()], [id(memory) for memory in memories])
+        self.assertEqual(environment.time_step, 0)
+        self.assertEqual(len(environment.events), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()